@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Depth-first search over a single mutable board with reversible moves.
+
+`frames[i]` holds the untried moves of the i-th node on the current path and
+`undos[i - 1]` the record of the move that led to it, so backtracking is an
+`unmake_move` instead of popping a private copy of the board. A child is only
+entered after its Zobrist key (`board.key`) is checked against `visited`,
+which explores nodes in the same order as the old copy-per-child stacks.
+`visited` comes from `transposition.new_visited`, so its memory can be capped.
+
+An unsolved result is only a proof when the search ran out of positions
+(`exhausted`); one cut off by the node limit says nothing about the deal.
+"""
+from typing import Any, Callable, List, NamedTuple
+
+import transposition
+
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"  # proven: every reachable position was searched
+UNKNOWN = "unknown"  # gave up at the node limit
+
+
+class SearchResult(NamedTuple):
+    solved: bool
+    nodes: int
+    solution_length: int = 0  # moves on the winning path; 0 when unsolved
+    exhausted: bool = False  # unsolved after covering every reachable position
+
+    @property
+    def verdict(self) -> str:
+        if self.solved:
+            return SOLVED
+        return UNSOLVABLE if self.exhausted else UNKNOWN
+
+
+def search(board: Any,
+           generate_moves: Callable[[Any], List[Any]],
+           make_move: Callable[[Any, Any], Any],
+           unmake_move: Callable[[Any, Any], None],
+           is_won: Callable[[Any], bool],
+           node_limit: int) -> SearchResult:
+    """Gives up once more than `node_limit` nodes are expanded."""
+    visited = transposition.new_visited()
+    nodes = 0
+    frames: List[List[Any]] = []
+    undos: List[Any] = []
+
+    while True:
+        if frames:
+            pending = frames[-1]
+            if not pending:
+                frames.pop()
+                if not frames:
+                    break
+                unmake_move(board, undos.pop())
+                continue
+            undo = make_move(board, pending.pop())
+            if board.key in visited:
+                unmake_move(board, undo)
+                continue
+            undos.append(undo)
+
+        visited.add(board.key)
+        nodes += 1
+        if nodes > node_limit:
+            return SearchResult(False, nodes)
+
+        if is_won(board):
+            return SearchResult(True, nodes, len(undos))
+
+        frames.append(generate_moves(board))
+
+    return SearchResult(False, nodes, exhausted=True)
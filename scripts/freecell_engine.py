@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+In-process FreeCell solver.
+
+Cards use the Klondike engine's ids (`suit * 13 + value - 1`, ids below 26
+are red), cascades are `bytearray`s, the free cells an unordered `bytearray`
+and the foundations four height counters. After every move, cards that
+`klondike_engine.safe_to_foundation` allows are played home automatically,
+so a search never branches on them.
+
+Sequence moves between cascades are supermoves: a run of alternating colours
+can move in one step if it is no longer than `(empty cells + 1) * 2 **
+empty cascades` (one fewer empty cascade when the target is empty), which is
+what moving it card by card through the free space could achieve.
+
+`solve` is a weighted best-first search like `klondike_engine.best_first`.
+Its Zobrist position keys ignore the order of the cascades and of the free
+cells, so shuffled copies of one position are searched once: each cascade
+keeps its own key, and the position key XORs them after a non-linear mix
+(a plain XOR of pile keys could not tell which cascade a card sits in).
+"""
+
+import heapq
+from typing import List, Optional, Sequence, Tuple
+
+import transposition
+from dfs import SearchResult
+from klondike_engine import (
+    CAN_STACK,
+    SUIT,
+    VALUE,
+    movable_run_start,
+    safe_to_foundation,
+)
+from zobrist import ZobristTable
+
+# ---------- Moves ----------
+
+# A move is (kind, source, count, target); `source` and `target` index a
+# cascade or free cell, `count` is the number of cards in a cascade move.
+CASCADE_TO_FOUNDATION = 0
+CELL_TO_FOUNDATION = 1
+CASCADE_TO_CASCADE = 2
+CELL_TO_CASCADE = 3
+CASCADE_TO_CELL = 4
+
+Move = Tuple[int, int, int, int]
+
+# ---------- Zobrist layout ----------
+
+# (depth, card) within a cascade; a free cell by card; a foundation by (suit, height)
+CASCADE = ZobristTable(52, 52, salt=0x4643)
+CELL_KEYS = ZobristTable(52, salt=0x4644).keys
+FOUNDATION_KEYS = ZobristTable(4 * 14, salt=0x4645).keys
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(h: int) -> int:
+    """splitmix64 finaliser: makes the XOR of cascade keys order-free but not linear."""
+    h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _MASK64
+    return h ^ (h >> 31)
+
+
+# ---------- State ----------
+
+
+class FreeCellState:
+    __slots__ = ("cascades", "cells", "foundations", "free_cells", "cascade_keys")
+
+    def __init__(
+        self,
+        cascades: List[bytearray],
+        cells: bytearray,
+        foundations: bytearray,
+        free_cells: int,
+        cascade_keys: Optional[List[int]] = None,
+    ):
+        self.cascades = cascades
+        self.cells = cells
+        self.foundations = foundations  # height per suit, 0..13
+        self.free_cells = free_cells
+        # CASCADE.pile_key of each cascade, kept up to date by the moves
+        self.cascade_keys = (
+            cascade_keys
+            if cascade_keys is not None
+            else [CASCADE.pile_key(0, col) for col in cascades]
+        )
+
+    def clone(self) -> "FreeCellState":
+        return FreeCellState(
+            [bytearray(col) for col in self.cascades],
+            bytearray(self.cells),
+            bytearray(self.foundations),
+            self.free_cells,
+            list(self.cascade_keys),
+        )
+
+    @property
+    def is_victory(self) -> bool:
+        return sum(self.foundations) == 52
+
+    @property
+    def key(self) -> int:
+        """64-bit Zobrist key of the position up to cascade and free-cell order."""
+        h = 0
+        for suit, height in enumerate(self.foundations):
+            h ^= FOUNDATION_KEYS[suit * 14 + height]
+        for card in self.cells:
+            h ^= CELL_KEYS[card]
+        for pile_key in self.cascade_keys:
+            h ^= _mix(pile_key)
+        return h
+
+
+def initial_state(
+    tableau: Sequence[Sequence[Tuple[int, int]]], free_cells: int = 4
+) -> FreeCellState:
+    """`tableau` as `generate_freecell_seeds.deal_tableau` gives it, bottom first."""
+    cascades = [bytearray(s * 13 + v - 1 for s, v in col) for col in tableau]
+    state = FreeCellState(cascades, bytearray(), bytearray(4), free_cells)
+    autoplay(state)
+    return state
+
+
+# ---------- Rules ----------
+
+
+def autoplay(state: FreeCellState) -> int:
+    """Play every safe card home, repeatedly; returns how many were played."""
+    foundations, cascade_keys = state.foundations, state.cascade_keys
+    played = 0
+    progress = True
+    while progress:
+        progress = False
+        for ci, col in enumerate(state.cascades):
+            while col:
+                card = col[-1]
+                if foundations[SUIT[card]] + 1 != VALUE[card] or not safe_to_foundation(
+                    foundations, card
+                ):
+                    break
+                col.pop()
+                cascade_keys[ci] ^= CASCADE.key(len(col), card)
+                foundations[SUIT[card]] += 1
+                played += 1
+                progress = True
+        cells = state.cells
+        for i in range(len(cells) - 1, -1, -1):
+            card = cells[i]
+            if foundations[SUIT[card]] + 1 == VALUE[card] and safe_to_foundation(
+                foundations, card
+            ):
+                del cells[i]
+                foundations[SUIT[card]] += 1
+                played += 1
+                progress = True
+    return played
+
+
+def generate_moves(state: FreeCellState) -> List[Move]:
+    """Foundation plays, then onto cards, then to empty cascades, then to free cells."""
+    cascades, cells, foundations = state.cascades, state.cells, state.foundations
+    empty_cells = state.free_cells - len(cells)
+    empty_cols = [i for i, col in enumerate(cascades) if not col]
+    first_empty = empty_cols[0] if empty_cols else -1
+    onto_card = (empty_cells + 1) << len(empty_cols)
+    onto_empty = onto_card >> 1
+
+    foundation_moves: List[Move] = []
+    tableau_moves: List[Move] = []
+    empty_moves: List[Move] = []
+    cell_moves: List[Move] = []
+
+    for i, card in enumerate(cells):
+        if foundations[SUIT[card]] + 1 == VALUE[card]:
+            foundation_moves.append((CELL_TO_FOUNDATION, i, 1, -1))
+        for to_idx, target in enumerate(cascades):
+            if target and CAN_STACK[card * 52 + target[-1]]:
+                tableau_moves.append((CELL_TO_CASCADE, i, 1, to_idx))
+        if first_empty >= 0:
+            empty_moves.append((CELL_TO_CASCADE, i, 1, first_empty))
+
+    for from_idx, col in enumerate(cascades):
+        if not col:
+            continue
+        top = col[-1]
+        if foundations[SUIT[top]] + 1 == VALUE[top]:
+            foundation_moves.append((CASCADE_TO_FOUNDATION, from_idx, 1, -1))
+        start = movable_run_start(col)
+        for to_idx, target in enumerate(cascades):
+            if to_idx == from_idx or not target:
+                continue
+            # at most one card of the run fits the target
+            for i in range(start, len(col)):
+                if CAN_STACK[col[i] * 52 + target[-1]]:
+                    if len(col) - i <= onto_card:
+                        tableau_moves.append(
+                            (CASCADE_TO_CASCADE, from_idx, len(col) - i, to_idx)
+                        )
+                    break
+        if first_empty >= 0:
+            # moving a whole cascade to an empty one only relabels it
+            longest = min(len(col) - start, onto_empty, len(col) - 1)
+            for count in range(longest, 0, -1):
+                empty_moves.append((CASCADE_TO_CASCADE, from_idx, count, first_empty))
+        if empty_cells:
+            cell_moves.append((CASCADE_TO_CELL, from_idx, 1, -1))
+
+    return foundation_moves + tableau_moves + empty_moves + cell_moves
+
+
+def apply_move(state: FreeCellState, move: Move) -> FreeCellState:
+    """The position after `move` and the safe foundation plays it unlocks."""
+    kind, source, count, target = move
+    child = state.clone()
+    cascades, cascade_keys = child.cascades, child.cascade_keys
+    if kind == CASCADE_TO_FOUNDATION:
+        card = cascades[source].pop()
+        cascade_keys[source] ^= CASCADE.key(len(cascades[source]), card)
+        child.foundations[SUIT[card]] += 1
+    elif kind == CELL_TO_FOUNDATION:
+        card = child.cells.pop(source)
+        child.foundations[SUIT[card]] += 1
+    elif kind == CASCADE_TO_CASCADE:
+        col, dest = cascades[source], cascades[target]
+        run = col[-count:]
+        cascade_keys[source] ^= CASCADE.pile_key(len(col) - count, run)
+        cascade_keys[target] ^= CASCADE.pile_key(len(dest), run)
+        dest += run
+        del col[-count:]
+    elif kind == CELL_TO_CASCADE:
+        card = child.cells.pop(source)
+        cascade_keys[target] ^= CASCADE.key(len(cascades[target]), card)
+        cascades[target].append(card)
+    elif kind == CASCADE_TO_CELL:
+        card = cascades[source].pop()
+        cascade_keys[source] ^= CASCADE.key(len(cascades[source]), card)
+        child.cells.append(card)
+    else:
+        raise ValueError(f"Unknown move kind: {kind}")
+    autoplay(child)
+    return child
+
+
+# ---------- Solver ----------
+
+
+def heuristic(state: FreeCellState) -> int:
+    """Cards off the foundations, plus cards above a lower card, plus occupied cells."""
+    h = 52 - sum(state.foundations) + len(state.cells)
+    for col in state.cascades:
+        lowest = 14
+        for card in col:
+            value = VALUE[card]
+            if value > lowest:
+                h += 1
+            else:
+                lowest = value
+    return h
+
+
+def solve(
+    tableau: Sequence[Sequence[Tuple[int, int]]],
+    free_cells: int = 4,
+    node_limit: int = 200_000,
+    weight: int = 4,
+    max_open: int = 50_000,
+) -> SearchResult:
+    """
+    Weighted A*: expand the open position with the lowest `depth + weight *
+    heuristic`. When more than `max_open` positions are queued the worse half
+    is dropped; an unsolved search that ever dropped positions is not a proof.
+    """
+    root = initial_state(tableau, free_cells)
+    visited = transposition.new_visited()
+    visited.add(root.key)
+    # (priority, tie-break, depth, state)
+    open_states = [(weight * heuristic(root), 0, 0, root)]
+    pushed = 1
+    nodes = 0
+    trimmed = False
+
+    while open_states:
+        _, _, depth, state = heapq.heappop(open_states)
+        nodes += 1
+        if nodes > node_limit:
+            return SearchResult(False, nodes)
+        if state.is_victory:
+            return SearchResult(True, nodes, depth)
+
+        for move in generate_moves(state):
+            child = apply_move(state, move)
+            key = child.key
+            if key not in visited:
+                visited.add(key)
+                heapq.heappush(
+                    open_states,
+                    (depth + 1 + weight * heuristic(child), pushed, depth + 1, child),
+                )
+                pushed += 1
+
+        if len(open_states) > max_open:
+            open_states = heapq.nsmallest(max_open // 2, open_states)
+            trimmed = True
+
+    return SearchResult(False, nodes, exhausted=not trimmed)
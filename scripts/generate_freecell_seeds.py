@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
+"""
+FreeCell seed mining.
+
+Deals match `FreeCellState.getInitialState` in Dart. Seeds are solved either
+by the vendored Solvitaire binary (this script's own command line), or
+in-process by `freecell_engine` through the shared miner:
+`python -m seedmine freecell` (or `--solver native` here).
+"""
+
 import argparse
 import json
 import os
+import queue
+import shlex
+import signal
 import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+import freecell_engine
+from dfs import SearchResult
+from seedmine.cli import main as seedmine_main
+from seedmine.journal import SeedJournal
+from seedmine.registry import GameSpec, Options, register_game
 from shared_rng import shuffle_with_seed
 
 # Default output mirrors other generators.
@@ -54,9 +76,7 @@ def _deal_freecell_like_dart(
     return tableau
 
 
-def deal_tableau(
-    seed: int, *, aces_at_bottom: bool = False
-) -> List[List[Card]]:
+def deal_tableau(seed: int, *, aces_at_bottom: bool = False) -> List[List[Card]]:
     deck = [(s, v) for s in SUITS_IN_ORDER for v in VALUES_IN_ORDER]
     shuffle_with_seed(deck, seed)
 
@@ -81,9 +101,7 @@ def card_to_str(card: Card) -> str:
 
 def tableau_to_json(tableau: List[List[Card]]) -> dict:
     return {
-        "tableau piles": [
-            [card_to_str(card) for card in column] for column in tableau
-        ]
+        "tableau piles": [[card_to_str(card) for card in column] for column in tableau]
     }
 
 
@@ -114,9 +132,7 @@ def run_solvitaire(
         rel_deal_path = str(deal_path.relative_to(solvitaire_root))
         cmd = [
             str(solvitaire_root / "enter-container.sh"),
-            " ".join(
-                ["./solvitaire", "--type", game_type, *extra_args, rel_deal_path]
-            ),
+            " ".join(["./solvitaire", "--type", game_type, *extra_args, rel_deal_path]),
         ]
     else:
         cmd = [
@@ -137,7 +153,7 @@ def run_solvitaire(
     return (result.stdout or "") + (result.stderr or "")
 
 
-def run_solvitaire_batch(
+def solvitaire_argv(
     deal_paths: List[Path],
     *,
     game_type: str,
@@ -145,8 +161,8 @@ def run_solvitaire_batch(
     use_docker: bool,
     timeout_ms: int,
     streamliner: Optional[str],
-    wall_timeout_s: Optional[float],
-) -> Tuple[str, bool]:
+) -> List[str]:
+    """The Solvitaire command line; in the container, paths relative to its root."""
     extra_args = []
     if timeout_ms > 0:
         extra_args += ["--timeout", str(timeout_ms)]
@@ -154,37 +170,230 @@ def run_solvitaire_batch(
         extra_args += ["--str", streamliner]
 
     if use_docker:
-        rel_deal_paths = [
-            str(path.relative_to(solvitaire_root)) for path in deal_paths
-        ]
-        cmd = [
-            str(solvitaire_root / "enter-container.sh"),
-            " ".join(
-                ["./solvitaire", "--type", game_type, *extra_args, *rel_deal_paths]
-            ),
-        ]
+        rel_deal_paths = [str(path.relative_to(solvitaire_root)) for path in deal_paths]
+        return ["./solvitaire", "--type", game_type, *extra_args, *rel_deal_paths]
+    return [
+        str(solvitaire_root / "solvitaire"),
+        "--type",
+        game_type,
+        *extra_args,
+        *[str(path) for path in deal_paths],
+    ]
+
+
+def run_solvitaire_batch(
+    deal_paths: List[Path],
+    *,
+    game_type: str,
+    solvitaire_root: Path,
+    use_docker: bool,
+    timeout_ms: int,
+    streamliner: Optional[str],
+    wall_timeout_s: Optional[float],
+) -> Tuple[str, bool]:
+    """
+    Run Solvitaire on `deal_paths`, reading its output as it is printed;
+    returns (output, timed_out). The solver is killed once a deal has gone
+    `wall_timeout_s` without finishing.
+    """
+    argv = solvitaire_argv(
+        deal_paths,
+        game_type=game_type,
+        solvitaire_root=solvitaire_root,
+        use_docker=use_docker,
+        timeout_ms=timeout_ms,
+        streamliner=streamliner,
+    )
+    if use_docker:
+        command = shlex.join(argv)
+        if wall_timeout_s:
+            # killing `enter-container.sh` leaves the solver running in the container
+            command = _with_backstop(command, wall_timeout_s * (len(deal_paths) + 1))
+        cmd = [str(solvitaire_root / "enter-container.sh"), command]
     else:
-        cmd = [
-            str(solvitaire_root / "solvitaire"),
-            "--type",
-            game_type,
-            *extra_args,
-            *[str(path) for path in deal_paths],
-        ]
+        cmd = argv
 
+    # a process group of its own, so a kill also reaches anything it started
+    proc = subprocess.Popen(
+        cmd,
+        cwd=solvitaire_root,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        start_new_session=True,
+    )
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+    threading.Thread(target=_pump, args=(proc.stdout, lines), daemon=True).start()
+    output, end = _read_deals(lines, wall_timeout_s)
+    if end is None:
+        _kill_group(proc)
+        return output + "\n[timeout] wall-clock timeout reached\n", True
+    proc.wait()
+    return output, False
+
+
+def _pump(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def _read_deals(
+    lines: "queue.Queue[Optional[str]]",
+    wall_timeout_s: Optional[float],
+    marker: Optional[str] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Collect Solvitaire output from `lines` as it arrives until the stream
+    ends or a line contains `marker`; returns (output, end) where end is
+    that line, "" at the end of the stream, or None if a deal ran longer
+    than `wall_timeout_s`. Each "Attempting to solve" or "Solution Type:"
+    line restarts the clock, so every deal gets the full budget however
+    long the batch.
+    """
+    output: List[str] = []
+    deadline = time.monotonic() + wall_timeout_s if wall_timeout_s else None
+    while True:
+        try:
+            line = lines.get(
+                timeout=(
+                    None if deadline is None else max(0.0, deadline - time.monotonic())
+                )
+            )
+        except queue.Empty:
+            return "".join(output), None
+        if line is None:
+            return "".join(output), ""
+        if marker is not None and marker in line:
+            return "".join(output), line
+        output.append(line)
+        if deadline is not None and (
+            "Attempting to solve " in line or "Solution Type:" in line
+        ):
+            deadline = time.monotonic() + wall_timeout_s
+
+
+def _with_backstop(command: str, seconds: float) -> str:
+    # `timeout 0` would disable the limit
+    return f"timeout -s KILL {max(seconds, 0.1):.1f} {command}"
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=solvitaire_root,
-            capture_output=True,
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+class SolvitaireSession:
+    """
+    One long-lived shell that runs Solvitaire commands written to its stdin:
+    entered once through `enter-container.sh sh` with Docker (which must
+    attach stdin, i.e. `docker exec -i`), or a local `sh` otherwise, which
+    also serves as a stand-in for tests with a fake `solvitaire`. Each
+    command ends with a marker line carrying its exit status. Output is
+    read as it is printed and a deal that runs past the wall-clock timeout
+    gets the shell killed and restarted; in the container, which that kill
+    does not reach, `timeout` inside the shell bounds the whole command.
+    """
+
+    def __init__(self, solvitaire_root: Path, use_docker: bool):
+        self.solvitaire_root = solvitaire_root
+        self.use_docker = use_docker
+        self.marker = f"__solvitaire_done_{uuid.uuid4().hex}__"
+        self.proc: Optional[subprocess.Popen] = None
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def _start(self) -> None:
+        shell = (
+            [str(self.solvitaire_root / "enter-container.sh"), "sh"]
+            if self.use_docker
+            else ["sh"]
+        )
+        self.proc = subprocess.Popen(
+            shell,
+            cwd=self.solvitaire_root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=False,
-            timeout=wall_timeout_s,
+            bufsize=1,
+            start_new_session=True,
         )
-        return (result.stdout or "") + (result.stderr or ""), False
-    except subprocess.TimeoutExpired as exc:
-        output = (exc.stdout or "") + (exc.stderr or "")
-        return output + "\n[timeout] wall-clock timeout reached\n", True
+        self.lines = queue.Queue()
+        threading.Thread(
+            target=_pump, args=(self.proc.stdout, self.lines), daemon=True
+        ).start()
+
+    def run(
+        self, argv: List[str], wall_timeout_s: Optional[float], deals: int
+    ) -> Tuple[str, bool]:
+        """Run Solvitaire on `deals` deals; returns (output, timed_out)."""
+        if self.proc is None or self.proc.poll() is not None:
+            self._start()
+        command = shlex.join(argv)
+        if wall_timeout_s and self.use_docker:
+            # killing the shell leaves the solver running in the container
+            command = _with_backstop(command, wall_timeout_s * (deals + 1))
+        # on its own line even when a killed solver left a partial one
+        self.proc.stdin.write(
+            f"{command} 2>&1; printf '\\n%s %s\\n' {self.marker} $?\n"
+        )
+        self.proc.stdin.flush()
+
+        output, end = _read_deals(self.lines, wall_timeout_s, self.marker)
+        if end is None:
+            self.close()
+            return output + "\n[timeout] wall-clock timeout reached\n", True
+        if not end:
+            self.close()
+            raise RuntimeError("Solvitaire session exited:\n" + output)
+        partial, status = end.split(self.marker, 1)
+        # 137: killed by `timeout -s KILL`
+        return output + partial, status.split()[0] == "137"
+
+    def close(self) -> None:
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                _kill_group(self.proc)
+            self.proc.wait()
+            self.proc = None
+
+
+class SessionPool:
+    """One `SolvitaireSession` per worker thread, all closed at the end of the run."""
+
+    def __init__(self, solvitaire_root: Path, use_docker: bool):
+        self.solvitaire_root = solvitaire_root
+        self.use_docker = use_docker
+        self.local = threading.local()
+        self.sessions: List[SolvitaireSession] = []
+        self.lock = threading.Lock()
+
+    def get(self) -> SolvitaireSession:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = SolvitaireSession(
+                self.solvitaire_root, self.use_docker
+            )
+            with self.lock:
+                self.sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        for session in self.sessions:
+            session.close()
+
+
+def last_attempted(output: str) -> Optional[str]:
+    """The deal Solvitaire announced last, i.e. the one it was on if it was killed."""
+    current_file = None
+    for line in output.splitlines():
+        if "Attempting to solve " in line:
+            current_file = line.split("Attempting to solve ", 1)[1].strip(" .")
+    return current_file
 
 
 def parse_batch_results(output: str) -> dict:
@@ -199,12 +408,220 @@ def parse_batch_results(output: str) -> dict:
     return results
 
 
+# ---------- Native mining ----------
+
+
+def mine_solve(seed: int, node_limit: int, options: Options) -> SearchResult:
+    return freecell_engine.solve(
+        deal_tableau(seed, aces_at_bottom=options["aces_at_bottom"]),
+        options["free_cells"],
+        node_limit,
+    )
+
+
+def classify(result: SearchResult, options: Options) -> Optional[str]:
+    return "easy" if result.solved else None
+
+
+def proves_unsolvable(options: Options) -> bool:
+    # the open list is trimmed when it overflows, so exhausting it proves nothing
+    # in general; only small searches that never trimmed end in a proof
+    return False
+
+
+register_game(
+    GameSpec(
+        name="freecell",
+        solve=mine_solve,
+        classify=classify,
+        default_out=DEFAULT_OUT_FILE,
+        options={
+            "--free-cells": dict(
+                type=int,
+                default=4,
+                choices=range(5),
+                help="freecell: number of free cells",
+            ),
+            "--aces-at-bottom": dict(
+                action="store_true",
+                default=False,
+                help="deal the aces to the bottom of the tableau (Difficulty.ace)",
+            ),
+        },
+        variant_options=("free_cells", "aces_at_bottom"),
+        proves_unsolvable=proves_unsolvable,
+    )
+)
+
+
+class DealRing:
+    """
+    Deal files reused by every batch instead of one file per seed: worker
+    thread k writes its batch to `ring_<k>_<i>.json`, truncating in place,
+    so a run touches at most jobs * batch files and removes them once at
+    the end. With an `archive` path every deal is also appended, as one
+    `{"seed": ..., "deal": ...}` line, to that single JSON-lines file.
+    """
+
+    def __init__(self, deals_dir: Path, archive: Optional[Path] = None):
+        self.deals_dir = deals_dir
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.workers = 0
+        self.paths: Set[Path] = set()
+        self.archive = (
+            open(archive, "a", encoding="utf-8") if archive is not None else None
+        )
+
+    def write(self, deals: List[Tuple[int, dict]]) -> List[Path]:
+        worker = getattr(self.local, "worker", None)
+        if worker is None:
+            with self.lock:
+                worker = self.local.worker = self.workers
+                self.workers += 1
+        paths = []
+        for i, (_, deal) in enumerate(deals):
+            deal_path = self.deals_dir / f"ring_{worker}_{i}.json"
+            with open(deal_path, "w", encoding="utf-8") as f:
+                json.dump(deal, f, separators=(",", ":"))
+            paths.append(deal_path)
+        with self.lock:
+            self.paths.update(paths)
+            if self.archive is not None:
+                self.archive.writelines(
+                    json.dumps({"seed": s, "deal": deal}, separators=(",", ":")) + "\n"
+                    for s, deal in deals
+                )
+                self.archive.flush()
+        return paths
+
+    def close(self) -> None:
+        for deal_path in self.paths:
+            try:
+                deal_path.unlink()
+            except OSError:
+                pass
+        if self.archive is not None:
+            self.archive.close()
+
+
+@dataclass(frozen=True)
+class SolvitaireRun:
+    """Settings shared by every Solvitaire batch of one mining run."""
+
+    game_type: str
+    solvitaire_root: Path
+    use_docker: bool
+    timeout_ms: int
+    streamliner: Optional[str]
+    wall_timeout_s: Optional[float]  # per deal, from the line announcing it
+    aces_at_bottom: bool
+    ring: DealRing
+    sessions: Optional[SessionPool] = (
+        None  # persistent shells; None spawns a process per run
+    )
+
+
+def _run_group(run: SolvitaireRun, deal_paths: List[Path]) -> Tuple[str, bool]:
+    if run.sessions is not None:
+        argv = solvitaire_argv(
+            deal_paths,
+            game_type=run.game_type,
+            solvitaire_root=run.solvitaire_root,
+            use_docker=run.use_docker,
+            timeout_ms=run.timeout_ms,
+            streamliner=run.streamliner,
+        )
+        return run.sessions.get().run(argv, run.wall_timeout_s, len(deal_paths))
+    return run_solvitaire_batch(
+        deal_paths,
+        game_type=run.game_type,
+        solvitaire_root=run.solvitaire_root,
+        use_docker=run.use_docker,
+        timeout_ms=run.timeout_ms,
+        streamliner=run.streamliner,
+        wall_timeout_s=run.wall_timeout_s,
+    )
+
+
+def _result_keys(run: SolvitaireRun, deal_path: Path) -> Tuple[str, str]:
+    """How Solvitaire's output may name `deal_path`: as passed, or by file name."""
+    key = (
+        str(deal_path)
+        if not run.use_docker
+        else str(deal_path.relative_to(run.solvitaire_root))
+    )
+    return key, deal_path.name
+
+
+def solve_batch(
+    seeds: List[int], run: SolvitaireRun
+) -> Tuple[List[int], Dict[int, Optional[str]], List[int]]:
+    """
+    Write the deals for `seeds`, solve them with Solvitaire and return
+    (seeds, Solution Type per seed or None, seeds that ran out of time).
+    Runs on a worker thread; the solver itself is a subprocess, so threads
+    overlap.
+
+    Each deal gets `wall_timeout_s` from the line announcing it. When one
+    runs out the solver is killed; the deals it finished are credited, the
+    deal it was on (from Solvitaire's "Attempting to solve" lines, or the
+    first unfinished one without such a line) is counted as timed out and
+    the deals after it are run again, so a hung deal costs its own budget.
+    """
+    paths = run.ring.write(
+        [
+            (s, tableau_to_json(deal_tableau(s, aces_at_bottom=run.aces_at_bottom)))
+            for s in seeds
+        ]
+    )
+
+    statuses: Dict[int, Optional[str]] = {s: None for s in seeds}
+    timed_out_seeds: List[int] = []
+    group = list(zip(seeds, paths))
+    while group:
+        output, timed_out = _run_group(run, [deal_path for _, deal_path in group])
+        results = parse_batch_results(output)
+        unfinished = []
+        for s, deal_path in group:
+            statuses[s] = next(
+                (
+                    results[key]
+                    for key in _result_keys(run, deal_path)
+                    if key in results
+                ),
+                None,
+            )
+            if statuses[s] is None:
+                unfinished.append((s, deal_path))
+        if not timed_out or not unfinished:
+            break
+        current = last_attempted(output)
+        stuck = next(
+            (
+                i
+                for i, (_, deal_path) in enumerate(unfinished)
+                if current in _result_keys(run, deal_path)
+            ),
+            0,
+        )
+        timed_out_seeds.append(unfinished[stuck][0])
+        group = unfinished[:stuck] + unfinished[stuck + 1 :]
+
+    return seeds, statuses, timed_out_seeds
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", default=DEFAULT_OUT_FILE)
     ap.add_argument("--target", type=int, default=365)
-    ap.add_argument("--batch", type=int, default=200)
     ap.add_argument("--solvitaire-batch", type=int, default=20)
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Solvitaire batches kept running at once (default: all cores)",
+    )
     ap.add_argument("--free-cells", type=int, default=4)
     ap.add_argument("--aces-at-bottom", action="store_true")
     ap.add_argument(
@@ -212,13 +629,51 @@ def main():
         default=str(Path(__file__).resolve().parent.parent / "vendor" / "Solvitaire"),
     )
     ap.add_argument("--no-docker", action="store_true")
+    ap.add_argument(
+        "--session",
+        action="store_true",
+        help="keep one shell per job open (inside the container with Docker) and run "
+        "every batch through it instead of entering the container each time",
+    )
     ap.add_argument("--timeout-ms", type=int, default=60_000)
-    ap.add_argument("--wall-timeout-s", type=float, default=None)
+    ap.add_argument(
+        "--wall-timeout-s",
+        type=float,
+        default=None,
+        help="wall-clock budget per deal, counted from the line Solvitaire announces "
+        "it with (default: --timeout-ms plus 10 s)",
+    )
     ap.add_argument("--streamliner", default="smart-solvability")
-    ap.add_argument("--keep-deals", action="store_true")
+    ap.add_argument(
+        "--keep-deals",
+        action="store_true",
+        help="append every deal to one JSON-lines archive, "
+        "<solvitaire-root>/tmp/freecell_deals/deals.jsonl",
+    )
     ap.add_argument("--stop-after-first", action="store_true")
+    ap.add_argument(
+        "--solver",
+        choices=("solvitaire", "native"),
+        default="solvitaire",
+        help="native: solve in-process with freecell_engine via the seedmine pool",
+    )
     args = ap.parse_args()
 
+    if args.solver == "native":
+        argv = [
+            "freecell",
+            "--out",
+            args.out,
+            "--target",
+            str(args.target),
+            "--free-cells",
+            str(args.free_cells),
+        ]
+        if args.aces_at_bottom:
+            argv.append("--aces-at-bottom")
+        seedmine_main(argv)
+        return
+
     solvitaire_root = Path(args.solvitaire_root).resolve()
     use_docker = not args.no_docker
     if args.streamliner.lower() == "none":
@@ -232,129 +687,82 @@ def main():
     deals_dir = solvitaire_root / "tmp" / "freecell_deals"
     deals_dir.mkdir(parents=True, exist_ok=True)
 
-    if os.path.exists(args.out):
-        existing = json.load(open(args.out, "r", encoding="utf-8")).get("seeds", [])
-    else:
-        existing = []
+    run = SolvitaireRun(
+        game_type=_game_type_for_free_cells(args.free_cells),
+        solvitaire_root=solvitaire_root,
+        use_docker=use_docker,
+        timeout_ms=args.timeout_ms,
+        streamliner=args.streamliner,
+        wall_timeout_s=args.wall_timeout_s,
+        aces_at_bottom=args.aces_at_bottom,
+        ring=DealRing(
+            deals_dir, deals_dir / "deals.jsonl" if args.keep_deals else None
+        ),
+        sessions=SessionPool(solvitaire_root, use_docker) if args.session else None,
+    )
 
-    found = set(int(s) for s in existing)
+    journal = SeedJournal(args.out)
+    found = journal.load()
     seed = (max(found) + 1) if found else 0
+    try:
+        mine_batches(args, run, journal, found, seed)
+    finally:
+        journal.compact(found)
+        run.ring.close()
+        if run.sessions is not None:
+            run.sessions.close()
 
-    while len(found) < args.target:
-        seeds_batch = list(range(seed, seed + args.batch))
-        seed += args.batch
+    print("DONE", len(found))
 
-        batch_paths = []
-        batch_seed_map = {}
-        for s in seeds_batch:
-            tableau = deal_tableau(s, aces_at_bottom=args.aces_at_bottom)
-            deal_json = tableau_to_json(tableau)
-            deal_path = deals_dir / f"seed_{s}.json"
-            with open(deal_path, "w", encoding="utf-8") as f:
-                json.dump(deal_json, f, separators=(",", ":"))
-            batch_paths.append(deal_path)
-            batch_seed_map[deal_path.name] = s
-
-            if len(batch_paths) >= args.solvitaire_batch:
-                output, timed_out = run_solvitaire_batch(
-                    batch_paths,
-                    game_type=_game_type_for_free_cells(args.free_cells),
-                    solvitaire_root=solvitaire_root,
-                    use_docker=use_docker,
-                    timeout_ms=args.timeout_ms,
-                    streamliner=args.streamliner,
-                    wall_timeout_s=args.wall_timeout_s,
-                )
-                if timed_out:
-                    print(
-                        f"TIMEOUT batch seeds {batch_seed_map[batch_paths[0].name]}.."
-                        f"{batch_seed_map[batch_paths[-1].name]}"
-                    )
-                    results = {}
-                else:
-                    results = parse_batch_results(output)
-
-                for deal_path in batch_paths:
-                    key = (
-                        str(deal_path)
-                        if not use_docker
-                        else str(deal_path.relative_to(solvitaire_root))
-                    )
-                    status = results.get(key) or results.get(str(deal_path.name))
-                    s = batch_seed_map[deal_path.name]
-                    if status == "solved":
-                        if s not in found:
+
+def mine_batches(
+    args: argparse.Namespace,
+    run: SolvitaireRun,
+    journal: SeedJournal,
+    found: Set[int],
+    seed: int,
+) -> None:
+    """
+    Solve batches from `seed` on until `found` reaches the target. `--jobs`
+    batches are kept running and each is credited as soon as it finishes,
+    in whatever order, so a slow batch (one with a hung deal, say) never
+    holds the others back. Once the target is reached no new batch starts,
+    but the running ones are still waited for and credited, so no seed
+    below the last one tried is left unevaluated; the run may end a few
+    finds over the target. Finds go to `journal`, which the caller compacts
+    into sorted order in `--out` once mining stops.
+    """
+    stopping = False
+    running: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        try:
+            while True:
+                while not stopping and len(running) < args.jobs:
+                    batch = list(range(seed, seed + args.solvitaire_batch))
+                    running.add(pool.submit(solve_batch, batch, run))
+                    seed += args.solvitaire_batch
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    seeds, statuses, timed_out = future.result()
+                    for s in seeds:
+                        if statuses[s] != "solved":
+                            print("TIMEOUT" if s in timed_out else "SKIP", s)
+                        elif s not in found:
                             found.add(s)
+                            journal.append(s, "solved", 0)
                             print("FOUND", s, f"[total={len(found)}]")
-                            with open(args.out, "w", encoding="utf-8") as f:
-                                json.dump(
-                                    {"seeds": sorted(found)}, f, separators=(",", ":")
-                                )
-                            if args.stop_after_first:
-                                print("STOP after first found")
-                                return
-                    else:
-                        print("SKIP", s)
-
-                if not args.keep_deals:
-                    for deal_path in batch_paths:
-                        try:
-                            deal_path.unlink()
-                        except OSError:
-                            pass
-
-                batch_paths = []
-                batch_seed_map = {}
-
-        if batch_paths:
-            output, timed_out = run_solvitaire_batch(
-                batch_paths,
-                game_type=_game_type_for_free_cells(args.free_cells),
-                solvitaire_root=solvitaire_root,
-                use_docker=use_docker,
-                timeout_ms=args.timeout_ms,
-                streamliner=args.streamliner,
-                wall_timeout_s=args.wall_timeout_s,
-            )
-            if timed_out:
-                print(
-                    f"TIMEOUT batch seeds {batch_seed_map[batch_paths[0].name]}.."
-                    f"{batch_seed_map[batch_paths[-1].name]}"
-                )
-                results = {}
-            else:
-                results = parse_batch_results(output)
-
-            for deal_path in batch_paths:
-                key = (
-                    str(deal_path)
-                    if not use_docker
-                    else str(deal_path.relative_to(solvitaire_root))
-                )
-                status = results.get(key) or results.get(str(deal_path.name))
-                s = batch_seed_map[deal_path.name]
-                if status == "solved":
-                    if s not in found:
-                        found.add(s)
-                        print("FOUND", s, f"[total={len(found)}]")
-                        with open(args.out, "w", encoding="utf-8") as f:
-                            json.dump(
-                                {"seeds": sorted(found)}, f, separators=(",", ":")
-                            )
-                        if args.stop_after_first:
-                            print("STOP after first found")
-                            return
-                else:
-                    print("SKIP", s)
-
-            if not args.keep_deals:
-                for deal_path in batch_paths:
-                    try:
-                        deal_path.unlink()
-                    except OSError:
-                        pass
-
-    print("DONE", len(found))
-
-if __name__=="__main__":
+                    if not stopping and args.stop_after_first and found:
+                        print("STOP after first found")
+                        stopping = True
+                    if len(found) >= args.target:
+                        stopping = True
+        except BaseException:
+            # a failed batch (or Ctrl-C) should not wait for the queued ones
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+if __name__ == "__main__":
     main()
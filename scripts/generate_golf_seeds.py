@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
-import json, os, multiprocessing
-from functools import lru_cache
-from shared_rng import shuffle_with_seed
+import sys
+import dfs
+import screening
+from seedmine.cli import main as seedmine_main
+from seedmine.registry import GameSpec, register_game
+from shared_rng import shuffled_deck
 
 OUT_FILE = "golf_easy_seeds.json"
 TARGET_COUNT = 365
-NODE_LIMIT = 200000
 
 # Value mapping: Ace=1 … King=13
 def rank(card_id: int) -> int:
@@ -24,8 +26,7 @@ def can_follow(prev_card, next_card, rollover):
 
 
 def initial_state(seed: int, start_with_draw=True, can_rollover=True):
-    deck = list(range(52))
-    shuffle_with_seed(deck, seed)
+    deck = shuffled_deck(seed)
 
     tableau = []
     idx = 0
@@ -42,92 +43,178 @@ def initial_state(seed: int, start_with_draw=True, can_rollover=True):
     return tableau, stock, completed, can_rollover
 
 
-def serialize(tableau, stock, completed):
-    return (
-        tuple(tuple(col) for col in tableau),
-        tuple(stock),
-        tuple(completed),
-    )
+class Board:
+    """Mutable position walked by the screening playouts with `make_move`/`unmake_move`."""
+    __slots__ = ("tableau", "stock", "completed", "can_roll")
 
+    def __init__(self, seed: int):
+        self.tableau, self.stock, self.completed, self.can_roll = initial_state(seed)
+
+
+# A move is the index of the tableau column to play from, or DRAW.
+DRAW = -1
 
-def golfs_solve(seed):
-    tableau, stock, completed, can_roll = initial_state(seed)
-    visited = set()
-    nodes = 0
 
-    stack = [(tableau, stock, completed)]
+def generate_moves(board):
+    prev = board.completed[-1] if board.completed else None
+    moves = []
 
-    while stack:
-        tableau, stock, completed = stack.pop()
-        key = serialize(tableau, stock, completed)
-        if key in visited:
-            continue
-        visited.add(key)
+    # Moves from tableau
+    for ci, col in enumerate(board.tableau):
+        if col and can_follow(prev, col[-1], board.can_roll):
+            moves.append(ci)
 
-        nodes += 1
-        if nodes > NODE_LIMIT:
-            return False, nodes
+    # Draw
+    if board.stock:
+        moves.append(DRAW)
 
-        # Victory?
-        if all(len(col) == 0 for col in tableau):
-            return True, nodes
+    return moves
+
+
+def make_move(board, move):
+    card = board.stock.pop() if move == DRAW else board.tableau[move].pop()
+    board.completed.append(card)
+    return move
+
+
+def unmake_move(board, move):
+    card = board.completed.pop()
+    if move == DRAW:
+        board.stock.append(card)
+    else:
+        board.tableau[move].append(card)
 
-        prev = completed[-1] if completed else None
 
-        # Moves from tableau
+def is_won(board):
+    return all(len(col) == 0 for col in board.tableau)
+
+
+def golfs_solve(seed):
+    """
+    Exact solver over the compact state (column heights, stock pointer, top rank).
+
+    Nothing else about a position matters: the cards left in a column are its
+    first `height` cards and only the top card's rank decides what plays next.
+    The search runs one layer per draw. A layer is the closure under tableau
+    plays of the positions left by the previous layer, with the newly drawn
+    card on top. Each (heights, top) pair is expanded once per layer. The
+    first layer that empties the tableau gives the fewest-draw solution, and
+    exhausting every layer proves the deal unsolvable, so no node limit is
+    needed. `nodes` counts expanded states; a winnable deal still expands the
+    full closure of every layer before its last one.
+    """
+    tableau, stock, completed, can_roll = initial_state(seed)
+    follows = screening.FOLLOWS[can_roll]
+    cols = [[rank(c) for c in col] for col in tableau]
+    draws_left = [rank(c) for c in reversed(stock)]
+    tableau_cards = sum(len(col) for col in cols)
+
+    # state = heights packed 3 bits per column, shifted past a 4-bit top rank
+    heights = 0
+    for ci, col in enumerate(cols):
+        heights |= len(col) << (3 * ci)
+    layer = {heights << 4 | (rank(completed[-1]) if completed else 0)}
+    nodes = 0
+    for draws in range(len(draws_left) + 1):
+        stack = list(layer)
+        reached = set()
+        while stack:
+            state = stack.pop()
+            nodes += 1
+            heights = state >> 4
+            if heights == 0:
+                return dfs.SearchResult(True, nodes, tableau_cards + draws)
+            reached.add(heights)
+            playable = follows[state & 15]
+            for ci in range(7):
+                h = (heights >> (3 * ci)) & 7
+                if h and playable[cols[ci][h - 1]]:
+                    child = (heights - (1 << (3 * ci))) << 4 | cols[ci][h - 1]
+                    if child not in layer:
+                        layer.add(child)
+                        stack.append(child)
+        if draws == len(draws_left):
+            break
+        top = draws_left[draws]
+        layer = {h << 4 | top for h in reached}
+    return dfs.SearchResult(False, nodes, exhausted=True)
+
+
+def can_ever_clear(tableau, stock, completed, rollover):
+    """
+    Necessary condition: order ignored, every tableau card needs some card of
+    a neighbouring rank that is either from the stock/waste or itself playable.
+    """
+    reachable = {rank(c) for c in stock} | {rank(c) for c in completed}
+    heights = [len(col) for col in tableau]
+    progress = True
+    while progress:
+        progress = False
         for ci, col in enumerate(tableau):
-            if not col:
-                continue
-            top = col[-1]
-            if can_follow(prev, top, can_roll):
-                new_tableau = [list(c) for c in tableau]
-                new_stock = list(stock)
-                new_completed = list(completed)
+            while heights[ci] and screening.neighbour_ranks(rank(col[heights[ci] - 1]), rollover) & reachable:
+                heights[ci] -= 1
+                reachable.add(rank(col[heights[ci]]))
+                progress = True
+    return not any(heights)
 
-                new_tableau[ci].pop()
-                new_completed.append(top)
 
-                stack.append((new_tableau, new_stock, new_completed))
+def playout_score(board, move):
+    # play from the tableau whenever possible, preferring plays that keep a
+    # run going and columns that are still tall
+    if move == DRAW:
+        return 0.0
+    col = board.tableau[move]
+    card = col[-1]
+    follows = False
+    for ci, other in enumerate(board.tableau):
+        top = other[-2] if ci == move and len(other) > 1 else (other[-1] if ci != move and other else None)
+        if top is not None and can_follow(card, top, board.can_roll):
+            follows = True
+            break
+    return 10.0 + (5.0 if follows else 0.0) + len(col)
 
-        # Draw
-        if stock:
-            new_tableau = [list(c) for c in tableau]
-            new_stock = stock[:-1]
-            new_completed = list(completed) + [stock[-1]]
-            stack.append((new_tableau, new_stock, new_completed))
 
-    return False, nodes
+def golfs_screen(seed):
+    """
+    Reachability check, then noisy greedy playouts. Most Golf deals are
+    winnable, so the check rarely rejects one; the playouts settle the
+    easy wins and leave the rest to `golfs_solve`.
+    """
+    tableau, stock, completed, rollover = initial_state(seed)
+    if not can_ever_clear(tableau, stock, completed, rollover):
+        return screening.DEAD
+    return screening.greedy_playouts(Board(seed), generate_moves, make_move, unmake_move,
+                                     is_won, playout_score, tries=32, noise=8.0, seed=seed)
 
 
-def worker(seed):
-    solved, nodes = golfs_solve(seed)
-    return seed if solved else None
+# ---------- Seed mining ----------
 
+def mine_solve(seed, node_limit, options):
+    return golfs_solve(seed)  # exact, so the node limit does not apply
 
-def main():
-    if os.path.exists(OUT_FILE):
-        existing = json.load(open(OUT_FILE))["seeds"]
-    else:
-        existing = []
 
-    found = set(existing)
-    seed = 0
+def mine_screen(seed, options):
+    return golfs_screen(seed)
 
-    pool = multiprocessing.Pool()
 
-    while len(found) < TARGET_COUNT:
-        batch = range(seed, seed + 200)
-        results = pool.map(worker, batch)
+def classify(result, options):
+    return "easy" if result.solved else None
 
-        for r in results:
-            if r is not None:
-                found.add(r)
-                print("FOUND:", r)
-                json.dump({"seeds": sorted(found)}, open(OUT_FILE, "w"))
 
-        seed += 200
+register_game(GameSpec(
+    name="golf",
+    solve=mine_solve,
+    screen=mine_screen,
+    classify=classify,
+    default_out=OUT_FILE,
+    default_target=TARGET_COUNT,
+    solver_version=4,
+    deck_size=52,
+))
 
-    print("Completed:", len(found))
+
+def main():
+    seedmine_main(["golf", *sys.argv[1:]])
 
 
 if __name__ == "__main__":
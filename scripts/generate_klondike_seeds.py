@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
-import json
-import os
+import sys
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Dict, Optional, Tuple, Set
-from multiprocessing import Pool, cpu_count
+from typing import List, Dict, Optional, Set
+
+import klondike_engine
+from dfs import SearchResult
+from seedmine.cli import main as seedmine_main
+from seedmine.registry import GameSpec, Options, register_game
+from seedmine.scheduler import MiningJob, mine
 
 # ---------- RNG + shuffle (must match Dart) ----------
 
@@ -383,6 +387,15 @@ def solve_seed(seed: int,
                draw_amount: int = 1,
                aces_at_bottom: bool = False,
                node_limit: int = 200_000) -> SolveResult:
+    res = klondike_engine.solve(seed, draw_amount, aces_at_bottom, node_limit)
+    return SolveResult(res.solved, res.nodes)
+
+
+def solve_seed_reference(seed: int,
+                         draw_amount: int = 1,
+                         aces_at_bottom: bool = False,
+                         node_limit: int = 200_000) -> SolveResult:
+    """DFS over the dataclass model above; kept to cross-check `klondike_engine`."""
     start = initial_state_from_seed(seed, draw_amount, aces_at_bottom)
     stack: List[SolverState] = [start]
     visited: Set[int] = {hash_state(start)}
@@ -407,30 +420,65 @@ def solve_seed(seed: int,
 
 # ---------- Parallel mining ----------
 
-def worker_task(args) -> Tuple[int, bool, int]:
-    seed, draw_amount, aces_at_bottom, node_limit = args
-    res = solve_seed(seed, draw_amount, aces_at_bottom, node_limit)
-    return seed, res.solved, res.nodes_expanded
-
-
-def load_existing_seeds(path: str) -> Set[int]:
-    if not os.path.exists(path):
-        return set()
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return set(int(s) for s in data.get("seeds", []))
-    except Exception:
-        return set()
-
-
-def save_seeds(path: str, seeds: Set[int]) -> None:
-    # Sorted for deterministic file
-    data = {"seeds": sorted(seeds)}
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, separators=(",", ":"))
-    os.replace(tmp, path)
+OUT_FILE = "klondike_medium_seeds.json"
+TARGET_COUNT = 2000  # how many seeds you want
+
+
+def mine_solve(seed: int, node_limit: int, options: Options) -> SearchResult:
+    if options["search"] == "best-first":
+        result, _ = klondike_engine.best_first(seed, options["draw_amount"], options["aces_at_bottom"],
+                                               node_limit, prune=options["prune"],
+                                               macros=options["draw_macros"])
+        return result
+    return klondike_engine.solve(seed, options["draw_amount"], options["aces_at_bottom"], node_limit,
+                                 prune=options["prune"], macros=options["draw_macros"])
+
+
+def classify(result: SearchResult, options: Options) -> Optional[str]:
+    # node count is the difficulty proxy: too few is trivial, too many is a slog
+    if result.solved and options["min_nodes"] <= result.nodes <= options["max_nodes"]:
+        return "medium"
+    return None
+
+
+def node_cap(options: Options) -> int:
+    # a win past max_nodes is rejected anyway, so searches can stop there
+    return options["max_nodes"]
+
+
+def proves_unsolvable(options: Options) -> bool:
+    # best-first drops open states when its queue overflows
+    return options["search"] == "dfs"
+
+
+KLONDIKE = register_game(GameSpec(
+    name="klondike",
+    solve=mine_solve,
+    classify=classify,
+    default_out=OUT_FILE,
+    default_target=TARGET_COUNT,
+    options={
+        "--draw-amount": dict(type=int, default=1, choices=(1, 3),
+                              help="klondike: cards turned per draw"),
+        "--aces-at-bottom": dict(action="store_true", default=False,
+                                 help="deal the aces to the bottom of the tableau (Difficulty.ace)"),
+        "--min-nodes": dict(type=int, default=5_000, help="klondike: fewest nodes for a medium seed"),
+        "--max-nodes": dict(type=int, default=50_000, help="klondike: most nodes for a medium seed"),
+        "--search": dict(choices=("dfs", "best-first"), default="dfs",
+                         help="klondike: ordered DFS, or heuristic best-first search (fewer nodes, "
+                              "short solutions; node counts are not comparable with dfs)"),
+        "--prune": dict(action="store_true", default=False,
+                        help="klondike: force safe foundation plays and skip column-symmetric moves "
+                             "(solves harder deals per node; node counts shift, so re-tune the "
+                             "medium window)"),
+        "--draw-macros": dict(action="store_true", default=False,
+                              help="klondike: replace single draws with one move per playable card "
+                                   "further through the stock cycle (node counts shift as with --prune)"),
+    },
+    variant_options=("draw_amount", "aces_at_bottom", "search", "prune", "draw_macros"),
+    node_cap=node_cap,
+    proves_unsolvable=proves_unsolvable,
+))
 
 
 def mine_seeds_parallel(
@@ -441,57 +489,31 @@ def mine_seeds_parallel(
     node_limit: int = 200_000,
     min_nodes: int = 5_000,
     max_nodes: int = 50_000,
-    batch_size: int = 200,
+    chunksize: int = 4,
+    search: str = "dfs",
+    prune: bool = False,
+    draw_macros: bool = False,
 ) -> None:
-    existing = load_existing_seeds(outfile)
-    print(f"Loaded {len(existing)} existing seeds from {outfile}")
-
-    found: Set[int] = set(existing)
-    seed = 0
-
-    # Skip seeds we've already found (so we don't spam prints for known ones)
-    if found:
-        seed = max(found) + 1
-
-    with Pool(processes=cpu_count()) as pool:
-        while len(found) < target_count:
-            batch = list(range(seed, seed + batch_size))
-            seed += batch_size
-
-            args_iter = [
-                (s, draw_amount, aces_at_bottom, node_limit) for s in batch
-            ]
-
-            for s, solved, nodes in pool.imap_unordered(worker_task, args_iter):
-                if solved and min_nodes <= nodes <= max_nodes:
-                    if s not in found:
-                        found.add(s)
-                        print(f"Seed {s} OK (nodes={nodes})  [total={len(found)}]")
-                        # write immediately so we can kill anytime
-                        save_seeds(outfile, found)
-                else:
-                    print(f"Seed {s} skipped (solved={solved}, nodes={nodes})")
-
-                if len(found) >= target_count:
-                    break
-
-    print(f"Done. Found {len(found)} seeds.")
+    job = MiningJob(
+        spec=KLONDIKE,
+        out=outfile,
+        target=target_count,
+        node_limit=node_limit,
+        options={
+            "draw_amount": draw_amount,
+            "aces_at_bottom": aces_at_bottom,
+            "min_nodes": min_nodes,
+            "max_nodes": max_nodes,
+            "search": search,
+            "prune": prune,
+            "draw_macros": draw_macros,
+        },
+    )
+    mine([job], chunksize=chunksize, verbose=True)
 
 
 def main():
-    OUT_FILE = "klondike_medium_seeds.json"
-    TARGET_COUNT = 2000  # how many seeds you want
-
-    mine_seeds_parallel(
-        outfile=OUT_FILE,
-        target_count=TARGET_COUNT,
-        draw_amount=1,          # classic
-        aces_at_bottom=False,   # Difficulty.ace => True
-        node_limit=200_000,
-        min_nodes=5_000,        # tune difficulty
-        max_nodes=50_000,
-        batch_size=200,
-    )
+    seedmine_main(["klondike", *sys.argv[1:]])
 
 
 if __name__ == "__main__":
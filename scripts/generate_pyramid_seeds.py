@@ -13,14 +13,19 @@ Moves:
 - Draw from stock to waste (moves stock.last -> waste).
 
 Goal: remove all pyramid cards.
+
+The solver packs a position into one int: a 28-bit removed mask, the number
+of cards turned from the stock and a mask of which of those were paired off.
 """
-import argparse
-import json
-import os
-import multiprocessing
-from typing import List, Optional, Tuple
+import sys
+from typing import Dict, List, Optional, Tuple
 
-from shared_rng import shuffle_with_seed
+import screening
+import transposition
+from dfs import SearchResult
+from seedmine.cli import main as seedmine_main
+from seedmine.registry import GameSpec, Options, register_game
+from shared_rng import shuffled_deck
 
 DEFAULT_OUT_FILE = "pyramid_easy_seeds.json"
 
@@ -30,8 +35,7 @@ def rank(card_id: int) -> int:
 
 
 def deal(seed: int, bury_aces: bool, start_with_waste_card: bool):
-    deck = list(range(52))
-    shuffle_with_seed(deck, seed)
+    deck = shuffled_deck(seed)
 
     if bury_aces:
         aces = [c for c in deck if rank(c) == 1]
@@ -56,164 +60,206 @@ def deal(seed: int, bury_aces: bool, start_with_waste_card: bool):
     return pyramid, stock, waste
 
 
-def has_card(pyr: List[List[Optional[int]]], row: int, col: int) -> bool:
-    if row < 0 or row >= len(pyr):
-        return False
-    if col < 0 or col >= len(pyr[row]):
-        return False
+# Positions are numbered row by row, slot = r * (r + 1) // 2 + c; a slot is
+# exposed once both slots in COVERED_BY[slot] (the row below) are removed.
+def slot(row: int, col: int) -> int:
+    return row * (row + 1) // 2 + col
+
+
+ALL_REMOVED = (1 << 28) - 1
+SLOT_ROWS = tuple(r for r in range(7) for _ in range(r + 1))
+COVERED_BY = tuple(0 if r == 6 else 3 << slot(r + 1, c) for r in range(7) for c in range(r + 1))
+
+# Above the removed mask the state records how many cards of the draw
+# sequence (the starting waste card, then the stock from its end) have been
+# turned onto the waste, and which of those have since been paired away.
+DRAWN_SHIFT = 28
+DRAWN_ONE = 1 << DRAWN_SHIFT
+CONSUMED_SHIFT = 33
+
+
+class Board:
+    """
+    One deal as the packed state int plus the rank tables it indexes.
+    `state` is the current position (walked by the screening playouts).
+    """
+    __slots__ = ("ranks", "draws", "state", "exposure")
+
+    def __init__(self, seed: int, bury_aces: bool, start_with_waste_card: bool):
+        pyr, stock, waste = deal(seed, bury_aces, start_with_waste_card)
+        self.ranks = [rank(card) for row in pyr for card in row]
+        self.draws = [rank(card) for card in waste + stock[::-1]]
+        self.state = len(waste) << DRAWN_SHIFT
+        self.exposure: Dict[int, Tuple[List[int], List[List[int]]]] = {}
+
+
+def pyramid_moves(ranks: List[int], removed: int) -> Tuple[List[int], List[List[int]]]:
+    """
+    For one removed mask: the slot bits cleared by each king and pyramid-pair
+    move (kings first, pairs in slot order), and the exposed slots by rank.
+    """
+    exposed = []
+    by_rank: List[List[int]] = [[] for _ in range(14)]
+    for s in range(28):
+        if not removed >> s & 1 and removed & COVERED_BY[s] == COVERED_BY[s]:
+            exposed.append(s)
+            by_rank[ranks[s]].append(s)
+    pairs = [1 << s for s in by_rank[13]]
+    for s in exposed:
+        need = 13 - ranks[s]
+        if need:
+            pairs.extend(1 << s | 1 << t for t in by_rank[need] if t > s)
+    return pairs, by_rank
+
+
+def successors(board: Board, state: int) -> List[int]:
+    """
+    Every position one move away, in the order kings, pyramid pairs, waste
+    pairs, waste king, draw. Partners come from a rank -> exposed slots index
+    instead of testing every pair, and the pyramid part is computed once per
+    removed mask.
+    """
+    removed = state & ALL_REMOVED
+    cached = board.exposure.get(removed)
+    if cached is None:
+        cached = board.exposure[removed] = pyramid_moves(board.ranks, removed)
+    pairs, by_rank = cached
+    out = [state | bits for bits in pairs]
+
+    drawn = state >> DRAWN_SHIFT & 31
+    waste = ((1 << drawn) - 1) & ~(state >> CONSUMED_SHIFT)
+    if waste:
+        top = waste.bit_length() - 1
+        top_bit = 1 << (CONSUMED_SHIFT + top)
+        need = 13 - board.draws[top]
+        if need:
+            out.extend(state | 1 << s | top_bit for s in by_rank[need])
+        else:
+            out.append(state | top_bit)
+
+    if drawn < len(board.draws):
+        out.append(state + DRAWN_ONE)
+    return out
+
+
+def solve(seed: int, bury_aces: bool, start_with_waste_card: bool, node_limit: int) -> SearchResult:
+    """
+    Depth-first search over packed states; each pending frame is the list of
+    unvisited successor states, so there is nothing to copy or undo. Gives up
+    once more than `node_limit` nodes are expanded.
+    """
+    board = Board(seed, bury_aces, start_with_waste_card)
+    visited = transposition.new_visited()
+    visited.add(board.state)
+    nodes = 1
+    frames = [successors(board, board.state)]
+    while frames:
+        pending = frames[-1]
+        if not pending:
+            frames.pop()
+            continue
+        state = pending.pop()
+        if state in visited:
+            continue
+        visited.add(state)
+        nodes += 1
+        if nodes > node_limit:
+            return SearchResult(False, nodes)
+        if state & ALL_REMOVED == ALL_REMOVED:
+            return SearchResult(True, nodes, len(frames))
+        frames.append(successors(board, state))
+    return SearchResult(False, nodes, exhausted=True)
+
+
+def related(a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    """True if one of the two pyramid positions covers the other (directly or not)."""
+    (r1, c1), (r2, c2) = sorted((a, b))
+    return r2 > r1 and c1 <= c2 <= c1 + (r2 - r1)
+
+
+def can_ever_clear(pyr: List[List[Optional[int]]], stock: List[int], waste: List[int]) -> bool:
+    """
+    Necessary condition: every non-King pyramid card needs a partner summing
+    to 13 that can be exposed at the same time, i.e. a stock/waste card or a
+    pyramid card that neither covers it nor is covered by it.
+    """
+    off_pyramid = {rank(c) for c in stock + waste}
+    positions = [(r, c) for r in range(7) for c in range(r + 1)]
+    for pos in positions:
+        need = 13 - rank(pyr[pos[0]][pos[1]])
+        if need == 0 or need in off_pyramid:
+            continue
+        if not any(rank(pyr[r][c]) == need and not related(pos, (r, c)) for (r, c) in positions):
+            return False
     return True
 
 
-def is_exposed(pyr: List[List[Optional[int]]], row: int, col: int) -> bool:
-    if not has_card(pyr, row, col):
-        return False
-    card = pyr[row][col]
-    if card is None:
-        return False
-    if row == len(pyr) - 1:
-        return True
-    left_covered = has_card(pyr, row + 1, col) and pyr[row + 1][col] is not None
-    right_covered = has_card(pyr, row + 1, col + 1) and pyr[row + 1][col + 1] is not None
-    return not (left_covered or right_covered)
+def playout_score(board: Board, child: int) -> float:
+    # clear pyramid cards whenever possible, bottom rows first; draw last
+    change = child ^ board.state
+    removed = change & ALL_REMOVED
+    score = sum(10.0 + SLOT_ROWS[s] for s in range(28) if removed >> s & 1)
+    return score + (1.0 if change >> CONSUMED_SHIFT else 0.0)
+
 
+def _moves(board: Board) -> List[int]:
+    return successors(board, board.state)
 
-def is_victory(pyr: List[List[Optional[int]]]) -> bool:
-    return all(all(c is None for c in row) for row in pyr)
 
+def _make(board: Board, child: int) -> int:
+    parent, board.state = board.state, child
+    return parent
 
-def serialize(pyr: List[List[Optional[int]]], stock: List[int], waste: List[int]):
-    return (
-        tuple(tuple(row) for row in pyr),
-        tuple(stock),
-        tuple(waste),
-    )
 
+def _unmake(board: Board, parent: int) -> None:
+    board.state = parent
 
-def solve(seed: int, bury_aces: bool, start_with_waste_card: bool, node_limit: int) -> Tuple[bool, int]:
+
+def screen(seed: int, bury_aces: bool, start_with_waste_card: bool) -> Optional[SearchResult]:
     pyr, stock, waste = deal(seed, bury_aces, start_with_waste_card)
-    visited = set()
-    nodes = 0
-    stack = [(pyr, stock, waste)]
-
-    while stack:
-        pyr, stock, waste = stack.pop()
-        key = serialize(pyr, stock, waste)
-        if key in visited:
-            continue
-        visited.add(key)
+    if not can_ever_clear(pyr, stock, waste):
+        return screening.DEAD
+    return screening.greedy_playouts(Board(seed, bury_aces, start_with_waste_card),
+                                     _moves, _make, _unmake,
+                                     lambda b: b.state & ALL_REMOVED == ALL_REMOVED,
+                                     playout_score, seed=seed)
 
-        nodes += 1
-        if nodes > node_limit:
-            return False, nodes
-
-        if is_victory(pyr):
-            return True, nodes
-
-        # Gather exposed cards
-        exposed_positions = []
-        exposed_cards = []
-        for r in range(7):
-            for c in range(r + 1):
-                if is_exposed(pyr, r, c):
-                    exposed_positions.append((r, c))
-                    exposed_cards.append(pyr[r][c])
-
-        # (A) Remove exposed King from pyramid
-        for (r, c) in exposed_positions:
-            card = pyr[r][c]
-            if card is None:
-                continue
-            if rank(card) == 13:
-                np = [list(row) for row in pyr]
-                np[r][c] = None
-                stack.append((np, list(stock), list(waste)))
-
-        # (B) Remove pair of exposed pyramid cards summing to 13
-        for i in range(len(exposed_positions)):
-            a = pyr[exposed_positions[i][0]][exposed_positions[i][1]]
-            if a is None:
-                continue
-            for j in range(i + 1, len(exposed_positions)):
-                b = pyr[exposed_positions[j][0]][exposed_positions[j][1]]
-                if b is None:
-                    continue
-                if rank(a) + rank(b) == 13:
-                    np = [list(row) for row in pyr]
-                    r1, c1 = exposed_positions[i]
-                    r2, c2 = exposed_positions[j]
-                    np[r1][c1] = None
-                    np[r2][c2] = None
-                    stack.append((np, list(stock), list(waste)))
-
-        # (C) Remove exposed pyramid card with waste top summing to 13
-        if waste:
-            wt = waste[-1]
-            for (r, c) in exposed_positions:
-                card = pyr[r][c]
-                if card is None:
-                    continue
-                if rank(card) + rank(wt) == 13:
-                    np = [list(row) for row in pyr]
-                    np[r][c] = None
-                    nw = waste[:-1]
-                    stack.append((np, list(stock), list(nw)))
-
-            # (D) Remove waste King
-            if rank(wt) == 13:
-                stack.append(([list(row) for row in pyr], list(stock), waste[:-1]))
-
-        # (E) Draw
-        if stock:
-            ns = stock[:-1]
-            nw = list(waste) + [stock[-1]]
-            stack.append(([list(row) for row in pyr], list(ns), nw))
-
-    return False, nodes
-
-
-def worker(args):
-    seed, bury_aces, start_with_waste_card, node_limit = args
-    ok, _ = solve(seed, bury_aces, start_with_waste_card, node_limit)
-    return seed if ok else None
 
+# ---------- Seed mining ----------
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--out", default=DEFAULT_OUT_FILE)
-    ap.add_argument("--target", type=int, default=365)
-    ap.add_argument("--node-limit", type=int, default=200_000)
-    ap.add_argument("--batch", type=int, default=200)
-    ap.add_argument("--bury-aces", action="store_true")
-    ap.add_argument("--start-with-waste", action="store_true")
-    args = ap.parse_args()
 
-    if os.path.exists(args.out):
-        existing = json.load(open(args.out, "r", encoding="utf-8")).get("seeds", [])
-    else:
-        existing = []
+def mine_solve(seed: int, node_limit: int, options: Options) -> SearchResult:
+    return solve(seed, options["bury_aces"], options["start_with_waste"], node_limit)
 
-    found = set(int(s) for s in existing)
-    seed = (max(found) + 1) if found else 0
 
-    with multiprocessing.Pool() as pool:
-        while len(found) < args.target:
-            batch = list(range(seed, seed + args.batch))
-            seed += args.batch
+def mine_screen(seed: int, options: Options) -> Optional[SearchResult]:
+    return screen(seed, options["bury_aces"], options["start_with_waste"])
 
-            task_args = [(s, args.bury_aces, args.start_with_waste, args.node_limit) for s in batch]
-            results = pool.map(worker, task_args)
 
-            for r in results:
-                if r is not None and r not in found:
-                    found.add(r)
-                    print("FOUND", r, f"[total={len(found)}]")
-                    with open(args.out, "w", encoding="utf-8") as f:
-                        json.dump({"seeds": sorted(found)}, f, separators=(",", ":"))
+def classify(result: SearchResult, options: Options) -> Optional[str]:
+    return "easy" if result.solved else None
 
-    print("DONE", len(found))
 
+register_game(GameSpec(
+    name="pyramid",
+    solve=mine_solve,
+    screen=mine_screen,
+    classify=classify,
+    default_out=DEFAULT_OUT_FILE,
+    options={
+        "--bury-aces": dict(action="store_true", default=False,
+                            help="pyramid: move the aces to the bottom of the stock"),
+        "--start-with-waste": dict(action="store_true", default=False,
+                                   help="pyramid: turn one stock card onto the waste before play"),
+    },
+    variant_options=("bury_aces", "start_with_waste"),
+    deck_size=52,
+))
 
-if __name__ == "__main__":
-    main()
+
+def main():
+    seedmine_main(["pyramid", *sys.argv[1:]])
 
 
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,72 @@
 #!/usr/bin/env python3
 """
-Spider seed mining (classic = 1-suit) matching the Dart implementation:
+Spider seed mining matching the Dart implementation:
 `SpiderSolitaireState.getInitialState` + move/deal/sequence removal rules.
+
+The 104-card deck is eight 13-card sets; with `suits` of 1, 2 or 4 the sets
+take suits round-robin. Cards are dealt as faces `suit * 13 + rank - 1`:
+duplicate cards share a face, so positions that differ only by which copy
+sits where have one Zobrist key. A movable run and a removable King..Ace
+sequence must be one suit; a run may be placed on any suit one rank higher.
 """
-import argparse
-import json
-import os
-import multiprocessing
-from typing import List, Tuple
+import sys
+from typing import List, Optional, Tuple
 
+import dfs
+from dfs import SearchResult
+from seedmine.cli import main as seedmine_main
+from seedmine.registry import GameSpec, Options, register_game
 from shared_rng import shuffle_with_seed
+from zobrist import ZobristTable
 
 DEFAULT_OUT_FILE = "spider_easy_seeds.json"
+SUIT_COUNTS = (1, 2, 4)
+
+# A move is (from_col, start_idx, to_col), or DEAL to deal a row from the stock.
+Move = Tuple[int, int, int]
+DEAL: Move = (-1, -1, -1)
+# (column, removed King..Ace run, flipped a hidden card)
+Removal = Tuple[int, bytearray, bool]
+# (move, flipped_from_col, cards_moved, removals, previous_key)
+Undo = Tuple[Move, bool, int, List[Removal], int]
+
+# Zobrist layout: (column, depth) slots for hidden and revealed faces, plus
+# the stock (always a suffix of the deal, so keyed by length) and completed count.
+FACES = 52
+HIDDEN_DEPTH = 5
+REVEALED_DEPTH = 104
+REVEALED_SLOT = 10 * HIDDEN_DEPTH
+ZOBRIST = ZobristTable(REVEALED_SLOT + 10 * REVEALED_DEPTH, FACES, salt=0x5350)
+STOCK_KEYS = ZobristTable(6, salt=0x5351).keys
+COMPLETED_KEYS = ZobristTable(9, salt=0x5352).keys
+
+# FITS[moving * FACES + target]: moving may be placed on target (rank only).
+# LINKS[upper * FACES + lower]: lower extends a movable run down from upper.
+FITS = bytes(1 if m % 13 + 1 == t % 13 else 0 for m in range(FACES) for t in range(FACES))
+LINKS = bytes(1 if FITS[lower * FACES + upper] and upper // 13 == lower // 13 else 0
+              for upper in range(FACES) for lower in range(FACES))
 
 
-def rank(card_id: int) -> int:
-    # deck is 8 sets of 13 ranks; rank is id % 13
-    return (card_id % 13) + 1
+def rank(face: int) -> int:
+    # a face (or a raw card id, 8 sets of 13) has rank id % 13 + 1
+    return (face % 13) + 1
 
 
-def initial_state(seed: int) -> Tuple[List[List[int]], List[List[int]], List[int], int]:
+def face(card_id: int, suits: int) -> int:
+    return (card_id // 13) % suits * 13 + card_id % 13
+
+
+def initial_state(seed: int, suits: int = 1) -> Tuple[List[bytearray], List[bytearray], bytearray, int]:
     """
-    Returns (hidden_cols, revealed_cols, stock, completed_sequences).
+    Returns (hidden_cols, revealed_cols, stock, completed_sequences) as faces.
     Stock order matches Dart: new cards are dealt from the FRONT of stock (index 0).
     """
-    deck = list(range(104))  # 8 sets of 13 (classic 1-suit)
+    deck = list(range(104))  # 8 sets of 13
     shuffle_with_seed(deck, seed)
+    deck = [face(card, suits) for card in deck]
 
-    hidden: List[List[int]] = []
-    revealed: List[List[int]] = []
+    hidden: List[bytearray] = []
+    revealed: List[bytearray] = []
 
     for i in range(10):
         cards_in_col = 6 if i < 4 else 5
@@ -36,173 +74,230 @@ def initial_state(seed: int) -> Tuple[List[List[int]], List[List[int]], List[int
         deck = deck[cards_in_col - 1 :]
         revealed_col = [deck[0]]
         deck = deck[1:]
-        hidden.append(hidden_col)
-        revealed.append(revealed_col)
+        hidden.append(bytearray(hidden_col))
+        revealed.append(bytearray(revealed_col))
 
-    stock = deck  # remaining
+    stock = bytearray(deck)  # remaining
     return hidden, revealed, stock, 0
 
 
-def is_descending(cards: List[int]) -> bool:
-    for i in range(len(cards) - 1):
-        if rank(cards[i]) != rank(cards[i + 1]) + 1:
-            return False
-    return True
+def run_start(col: bytearray) -> int:
+    """Index of the deepest card of the same-suit descending run at the top of `col`."""
+    i = len(col) - 1
+    while i > 0 and LINKS[col[i - 1] * FACES + col[i]]:
+        i -= 1
+    return i
 
 
 def can_place_on(target_top: int, moving_bottom: int) -> bool:
-    return rank(moving_bottom) + 1 == rank(target_top)
+    return FITS[moving_bottom * FACES + target_top] == 1
+
+
+def revealed_key(col: int, depth: int, card: int) -> int:
+    return ZOBRIST.key(REVEALED_SLOT + col * REVEALED_DEPTH + depth, card)
 
 
-def flip_if_needed(hidden: List[List[int]], revealed: List[List[int]], col: int) -> None:
+def run_key(col: int, start: int, cards: bytearray) -> int:
+    return ZOBRIST.pile_key(REVEALED_SLOT + col * REVEALED_DEPTH + start, cards)
+
+
+def flip_if_needed(hidden: List[bytearray], revealed: List[bytearray], col: int) -> int:
+    """Flip a hidden card onto an empty revealed column; returns the key delta."""
     if revealed[col]:
-        return
+        return 0
     if hidden[col]:
-        revealed[col].append(hidden[col].pop())
+        card = hidden[col].pop()
+        revealed[col].append(card)
+        return ZOBRIST.key(col * HIDDEN_DEPTH + len(hidden[col]), card) ^ revealed_key(col, 0, card)
+    return 0
 
 
-def remove_complete_sequences(hidden: List[List[int]], revealed: List[List[int]]) -> int:
+def remove_complete_sequences(hidden: List[bytearray], revealed: List[bytearray]) -> Tuple[List[Removal], int]:
     """
     Mimics Dart `_checkAndRemoveCompleteSequences`:
-    - If last 13 revealed cards are a descending King->Ace run, remove them.
+    - If last 13 revealed cards are a same-suit King->Ace run, remove them.
     - Then flip a hidden card if revealed becomes empty.
-    Returns the number of sequences removed.
+    Returns the removed runs as (column, cards, flipped) and the key delta.
     """
-    removed = 0
+    removals: List[Removal] = []
+    delta = 0
     for i in range(10):
         col = revealed[i]
-        if len(col) < 13:
+        if len(col) < 13 or rank(col[-1]) != 1:
             continue
-        last13 = col[-13:]
-        if rank(last13[0]) == 13 and rank(last13[-1]) == 1 and is_descending(last13):
+        if run_start(col) <= len(col) - 13:
+            last13 = col[-13:]
+            delta ^= run_key(i, len(col) - 13, last13)
             del col[-13:]
-            removed += 1
-            flip_if_needed(hidden, revealed, i)
-    return removed
+            flipped = not col and bool(hidden[i])
+            delta ^= flip_if_needed(hidden, revealed, i)
+            removals.append((i, last13, flipped))
+    return removals, delta
 
 
-def serialize(hidden: List[List[int]], revealed: List[List[int]], stock: List[int], completed: int):
-    return (
-        tuple(tuple(c) for c in hidden),
-        tuple(tuple(c) for c in revealed),
-        tuple(stock),
-        completed,
-    )
+def full_hash(hidden: List[bytearray], revealed: List[bytearray], stock: bytearray, completed: int) -> int:
+    h = STOCK_KEYS[len(stock) // 10] ^ COMPLETED_KEYS[completed]
+    for i in range(10):
+        h ^= ZOBRIST.pile_key(i * HIDDEN_DEPTH, hidden[i])
+        h ^= run_key(i, 0, revealed[i])
+    return h
+
 
+class Board:
+    """Mutable position walked by `solve` with `make_move`/`unmake_move`."""
+    __slots__ = ("hidden", "revealed", "stock", "stock_pos", "completed", "key")
 
-def solve(seed: int, node_limit: int) -> Tuple[bool, int]:
-    hidden, revealed, stock, completed = initial_state(seed)
+    def __init__(self, seed: int, suits: int = 1):
+        self.hidden, self.revealed, self.stock, self.completed = initial_state(seed, suits)
+        self.stock_pos = 0  # cards before this index have been dealt
+        self.key = full_hash(self.hidden, self.revealed, self.stock, self.completed)
 
-    visited = set()
-    nodes = 0
-    stack = [(hidden, revealed, stock, completed)]
 
-    while stack:
-        hidden, revealed, stock, completed = stack.pop()
-        key = serialize(hidden, revealed, stock, completed)
-        if key in visited:
+def generate_moves(board: Board) -> List[Move]:
+    """
+    Canonical moves only: a run goes to the first empty column and only
+    whole (maximal) runs go there, never a run that is already a whole
+    column; a run on a card of the same rank as the target's top only moves
+    if that gains a same-suit link. The skipped moves can occasionally
+    matter, so `solve` does not treat an exhausted search as a proof.
+    """
+    moves: List[Move] = []
+    revealed = board.revealed
+    empty = next((col for col in range(10) if not revealed[col]), -1)
+
+    # Move same-suit descending revealed suffixes between columns
+    for from_col in range(10):
+        src = revealed[from_col]
+        if not src:
             continue
-        visited.add(key)
-
-        nodes += 1
-        if nodes > node_limit:
-            return False, nodes
-
-        # Remove completed sequences after every move/deal just like the UI
-        h2 = [list(c) for c in hidden]
-        r2 = [list(c) for c in revealed]
-        completed2 = completed + remove_complete_sequences(h2, r2)
-        hidden, revealed, completed = h2, r2, completed2
-
-        if completed == 8:
-            return True, nodes
-
-        # Moves: move any descending revealed suffix between columns
-        for from_col in range(10):
-            src = revealed[from_col]
-            if not src:
-                continue
-
-            for start_idx in range(len(src)):
-                moving = src[start_idx:]
-                if not is_descending(moving):
+
+        start = run_start(src)
+        whole_column = start == 0 and not board.hidden[from_col]
+        for start_idx in range(start, len(src)):
+            moving_bottom = src[start_idx]
+            below = src[start_idx - 1] if start_idx else -1
+            for to_col in range(10):
+                if to_col == from_col:
                     continue
+                dst = revealed[to_col]
+                if not dst:
+                    if to_col != empty or start_idx != start or whole_column:
+                        continue
+                elif not can_place_on(dst[-1], moving_bottom):
+                    continue
+                elif (below >= 0 and rank(below) == rank(dst[-1]) and
+                      LINKS[below * FACES + moving_bottom] >= LINKS[dst[-1] * FACES + moving_bottom]):
+                    # same-rank shuffle that does not improve the run
+                    continue
+                moves.append((from_col, start_idx, to_col))
 
-                moving_bottom = moving[0]
+    # Deal from stock: only if all columns have at least one revealed card
+    if len(board.stock) - board.stock_pos >= 10 and all(col for col in revealed):
+        moves.append(DEAL)
+
+    return moves
 
-                for to_col in range(10):
-                    if to_col == from_col:
-                        continue
-                    dst = revealed[to_col]
-                    if dst and not can_place_on(dst[-1], moving_bottom):
-                        continue
 
-                    nh = [list(c) for c in hidden]
-                    nr = [list(c) for c in revealed]
-                    ns = list(stock)
-                    nc = completed
+def make_move(board: Board, move: Move) -> Undo:
+    """Apply `move` in place, removing completed sequences like the UI does."""
+    hidden, revealed = board.hidden, board.revealed
+    old_key = key = board.key
+    flipped = False
+    moved = 0
 
-                    mv = nr[from_col][start_idx:]
-                    del nr[from_col][start_idx:]
-                    nr[to_col].extend(mv)
-                    flip_if_needed(nh, nr, from_col)
-                    nc += remove_complete_sequences(nh, nr)
-                    stack.append((nh, nr, ns, nc))
+    if move is DEAL:
+        remaining = len(board.stock) - board.stock_pos
+        key ^= STOCK_KEYS[remaining // 10] ^ STOCK_KEYS[remaining // 10 - 1]
+        for i, card in enumerate(board.stock[board.stock_pos:board.stock_pos + 10]):
+            key ^= revealed_key(i, len(revealed[i]), card)
+            revealed[i].append(card)
+        board.stock_pos += 10
+    else:
+        from_col, start_idx, to_col = move
+        src, dst = revealed[from_col], revealed[to_col]
+        mv = src[start_idx:]
+        moved = len(mv)
+        key ^= run_key(from_col, start_idx, mv) ^ run_key(to_col, len(dst), mv)
+        del src[start_idx:]
+        dst.extend(mv)
+        flipped = not src and bool(hidden[from_col])
+        key ^= flip_if_needed(hidden, revealed, from_col)
+
+    removals, delta = remove_complete_sequences(hidden, revealed)
+    if removals:
+        completed = board.completed
+        key ^= delta ^ COMPLETED_KEYS[completed] ^ COMPLETED_KEYS[completed + len(removals)]
+        board.completed = completed + len(removals)
+    board.key = key
+    return move, flipped, moved, removals, old_key
+
+
+def unmake_move(board: Board, undo: Undo) -> None:
+    move, flipped, moved, removals, old_key = undo
+    hidden, revealed = board.hidden, board.revealed
+
+    for col, run, flipped_col in reversed(removals):
+        if flipped_col:
+            hidden[col].append(revealed[col].pop())
+        revealed[col].extend(run)
+    board.completed -= len(removals)
+
+    if move is DEAL:
+        board.stock_pos -= 10
+        for col in revealed:
+            col.pop()
+    else:
+        from_col, _, to_col = move
+        if flipped:
+            hidden[from_col].append(revealed[from_col].pop())
+        dst = revealed[to_col]
+        revealed[from_col].extend(dst[-moved:])
+        del dst[-moved:]
+    board.key = old_key
 
-        # Deal from stock: only if all columns have at least one revealed card
-        if len(stock) >= 10 and all(col for col in revealed):
-            nh = [list(c) for c in hidden]
-            nr = [list(c) for c in revealed]
-            ns = list(stock)
-            nc = completed
 
-            deal = ns[:10]
-            ns = ns[10:]
-            for i in range(10):
-                nr[i].append(deal[i])
+def solve(seed: int, node_limit: int, suits: int = 1) -> SearchResult:
+    result = dfs.search(Board(seed, suits), generate_moves, make_move, unmake_move,
+                        lambda board: board.completed == 8, node_limit)
+    # canonical move generation can skip a needed split, so no proofs
+    return result._replace(exhausted=False)
 
-            nc += remove_complete_sequences(nh, nr)
-            stack.append((nh, nr, ns, nc))
 
-    return False, nodes
+# ---------- Seed mining ----------
 
 
-def worker(args):
-    seed, node_limit = args
-    ok, _ = solve(seed, node_limit=node_limit)
-    return seed if ok else None
+def mine_solve(seed: int, node_limit: int, options: Options) -> SearchResult:
+    return solve(seed, node_limit, options["suits"])
+
+
+def classify(result: SearchResult, options: Options) -> Optional[str]:
+    return "easy" if result.solved else None
+
+
+def proves_unsolvable(options: Options) -> bool:
+    # canonical move generation skips moves, so an exhausted search is no proof
+    return False
+
+
+register_game(GameSpec(
+    name="spider",
+    solve=mine_solve,
+    classify=classify,
+    default_out=DEFAULT_OUT_FILE,
+    options={
+        "--suits": dict(type=int, default=1, choices=SUIT_COUNTS,
+                        help="spider: suits in the deck (runs and removed sequences must be one suit)"),
+    },
+    variant_options=("suits",),
+    # v2: positions are keyed by face, so duplicate cards no longer split nodes
+    # v3: canonical move generation
+    solver_version=3,
+    proves_unsolvable=proves_unsolvable,
+))
 
 
 def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--out", default=DEFAULT_OUT_FILE)
-    ap.add_argument("--target", type=int, default=365)
-    ap.add_argument("--node-limit", type=int, default=200_000)
-    ap.add_argument("--batch", type=int, default=100)
-    args = ap.parse_args()
-
-    if os.path.exists(args.out):
-        existing = json.load(open(args.out, "r", encoding="utf-8")).get("seeds", [])
-    else:
-        existing = []
-
-    found = set(int(s) for s in existing)
-    seed = (max(found) + 1) if found else 0
-
-    with multiprocessing.Pool() as pool:
-        while len(found) < args.target:
-            batch = list(range(seed, seed + args.batch))
-            seed += args.batch
-            task_args = [(s, args.node_limit) for s in batch]
-            results = pool.map(worker, task_args)
-            for r in results:
-                if r is not None and r not in found:
-                    found.add(r)
-                    print("FOUND", r, f"[total={len(found)}]")
-                    with open(args.out, "w", encoding="utf-8") as f:
-                        json.dump({"seeds": sorted(found)}, f, separators=(",", ":"))
-
-    print("DONE", len(found))
+    seedmine_main(["spider", *sys.argv[1:]])
 
 
 if __name__ == "__main__":
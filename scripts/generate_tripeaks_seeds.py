@@ -1,22 +1,18 @@
 #!/usr/bin/env python3
-import json, os, multiprocessing
-from shared_rng import shuffle_with_seed
+import sys
+import dfs
+import screening
+from seedmine.cli import main as seedmine_main
+from seedmine.registry import GameSpec, register_game
+from shared_rng import shuffled_deck
 
 OUT_FILE = "tripeaks_easy_seeds.json"
 TARGET_COUNT = 365
-NODE_LIMIT = 200000
 
 def rank(card_id): return (card_id % 13) + 1
-def can_follow(prev, nxt, rollover):
-    if prev is None: return True
-    a, b = rank(prev), rank(nxt)
-    if abs(a-b)==1: return True
-    if rollover and {a,b}=={1,13}: return True
-    return False
 
 def initial_state(seed, start_with_waste=True, rollover=True):
-    deck = list(range(52))
-    shuffle_with_seed(deck, seed)
+    deck = shuffled_deck(seed)
 
     tableau = []
     idx = 0
@@ -33,107 +29,137 @@ def initial_state(seed, start_with_waste=True, rollover=True):
     return tableau, stock, waste, rollover
 
 
-def is_exposed(tableau, row, col):
-    card = tableau[row][col]
-    if card is None: return False
-    if row==3: return True
+# Tableau slots are numbered row by row (rows of 3, 6, 9, 10 from the peaks
+# down); a slot is exposed once every slot in COVERED_BY[slot] is removed.
+ROW_OFFSETS = (0, 3, 9, 18)
+ALL_REMOVED = (1 << 28) - 1
 
-    if row==2:
-        return tableau[3][col] is None and tableau[3][col+1] is None
+def _coverers(row, col):
+    if row == 3: return ()
+    if row == 2: return ((3, col), (3, col + 1))
+    if row == 1:
+        base = (col // 2) * 3 + col % 2
+        return ((2, base), (2, base + 1))
+    return ((1, 2 * col), (1, 2 * col + 1))
 
-    if row==1:
-        peak_group = col//2
-        pos = col%2
-        base = peak_group*3
-        if pos==0:
-            return tableau[2][base] is None and tableau[2][base+1] is None
-        else:
-            return tableau[2][base+1] is None and tableau[2][base+2] is None
+COVERED_BY = tuple(sum(1 << (ROW_OFFSETS[r] + c) for r, c in _coverers(row, col))
+                   for row, length in enumerate((3, 6, 9, 10)) for col in range(length))
 
-    if row==0:
-        return tableau[1][2*col] is None and tableau[1][2*col+1] is None
-
-    return False
-
-
-def serialize(tableau, stock, waste):
-    return (
-        tuple(tuple(c if c is None else c for c in row) for row in tableau),
-        tuple(stock),
-        tuple(waste),
-    )
+def slot_ranks(tableau):
+    return [rank(card) for row in tableau for card in row]
 
 
 def solve(seed):
+    """
+    Exact solver over (removed-slot mask, stock pointer, waste-top rank).
+
+    The search runs one layer per draw. Each layer is the closure under
+    tableau plays, with every (mask, top) pair expanded once. The first layer
+    that clears all 28 slots gives the fewest-draw solution (28 plays plus
+    the draws). Exhausting every layer proves the deal unsolvable, so there
+    is no node limit. `nodes` counts expanded states.
+    """
     tableau, stock, waste, rollover = initial_state(seed)
-    visited=set()
-    nodes=0
-
-    stack=[(tableau,stock,waste)]
+    follows = screening.FOLLOWS[rollover]
+    ranks = slot_ranks(tableau)
+    draws_left = [rank(c) for c in reversed(stock)]
+    slots = [(1 << slot, COVERED_BY[slot], ranks[slot]) for slot in range(28)]
+
+    # state = removed mask shifted past a 4-bit top rank
+    layer = {rank(waste[-1]) if waste else 0}
+    nodes = 0
+    for draws in range(len(draws_left) + 1):
+        stack = list(layer)
+        reached = set()
+        while stack:
+            state = stack.pop()
+            nodes += 1
+            removed = state >> 4
+            if removed == ALL_REMOVED:
+                return dfs.SearchResult(True, nodes, 28 + draws)
+            reached.add(removed)
+            playable = follows[state & 15]
+            for bit, covered_by, r in slots:
+                if not removed & bit and removed & covered_by == covered_by and playable[r]:
+                    child = (removed | bit) << 4 | r
+                    if child not in layer:
+                        layer.add(child)
+                        stack.append(child)
+        if draws == len(draws_left):
+            break
+        top = draws_left[draws]
+        layer = {removed << 4 | top for removed in reached}
+    return dfs.SearchResult(False, nodes, exhausted=True)
+
+
+def can_ever_clear(tableau, stock, waste, rollover):
+    """
+    Necessary condition: order ignored, every tableau card must be uncovered
+    by playable cards and have a neighbouring rank that is either from the
+    stock/waste or itself playable.
+    """
+    ranks = slot_ranks(tableau)
+    reachable = {rank(c) for c in stock} | {rank(c) for c in waste}
+    removed = 0
+    progress = True
+    while progress:
+        progress = False
+        for slot in range(28):
+            if (not removed >> slot & 1 and removed & COVERED_BY[slot] == COVERED_BY[slot]
+                    and screening.neighbour_ranks(ranks[slot], rollover) & reachable):
+                removed |= 1 << slot
+                reachable.add(ranks[slot])
+                progress = True
+    return removed == ALL_REMOVED
+
+
+def screen(seed):
+    # no playouts: their wins are longer than the shortest solution `classify` grades
+    tableau, stock, waste, rollover = initial_state(seed)
+    if not can_ever_clear(tableau, stock, waste, rollover):
+        return screening.DEAD
+    return None
 
-    while stack:
-        tableau,stock,waste = stack.pop()
-        key=serialize(tableau,stock,waste)
-        if key in visited: continue
-        visited.add(key)
 
-        nodes+=1
-        if nodes>NODE_LIMIT: return False,nodes
+# ---------- Seed mining ----------
 
-        if all(all(c is None for c in row) for row in tableau):
-            return True,nodes
+def mine_solve(seed, node_limit, options):
+    return solve(seed)  # exact, so the node limit does not apply
 
-        prev = waste[-1] if waste else None
 
-        # tableau moves
-        for r,row in enumerate(tableau):
-            for c,card in enumerate(row):
-                if card is None: continue
-                if is_exposed(tableau,r,c) and can_follow(prev,card,rollover):
-                    newt=[list(rr) for rr in tableau]
-                    newt[r][c]=None
-                    ns=list(stock)
-                    nw=list(waste)+[card]
-                    stack.append((newt,ns,nw))
+def mine_screen(seed, options):
+    return screen(seed)
 
-        # draw
-        if stock:
-            newt=[list(rr) for rr in tableau]
-            ns=stock[:-1]
-            nw=list(waste)+[stock[-1]]
-            stack.append((newt,ns,nw))
 
-    return False,nodes
+def classify(result, options):
+    # solution length (28 plays + draws) grades the deal; the default window accepts any win
+    if not result.solved or result.solution_length < options["min_length"]:
+        return None
+    if options["max_length"] is not None and result.solution_length > options["max_length"]:
+        return None
+    return "easy"
 
 
-def worker(seed):
-    ok,n = solve(seed)
-    return seed if ok else None
+register_game(GameSpec(
+    name="tripeaks",
+    solve=mine_solve,
+    screen=mine_screen,
+    classify=classify,
+    default_out=OUT_FILE,
+    default_target=TARGET_COUNT,
+    options={
+        "--min-length": dict(type=int, default=0,
+                             help="tripeaks: fewest moves in the shortest solution"),
+        "--max-length": dict(type=int, default=None,
+                             help="tripeaks: most moves in the shortest solution"),
+    },
+    solver_version=2,
+    deck_size=52,
+))
 
 
 def main():
-    if os.path.exists(OUT_FILE):
-        seeds=json.load(open(OUT_FILE))["seeds"]
-    else:
-        seeds=[]
-
-    found=set(seeds)
-    seed=0
-    pool=multiprocessing.Pool()
-
-    while len(found)<TARGET_COUNT:
-        batch=range(seed,seed+200)
-        results=pool.map(worker,batch)
-
-        for r in results:
-            if r is not None:
-                found.add(r)
-                print("FOUND",r)
-                json.dump({"seeds":sorted(found)},open(OUT_FILE,"w"))
-
-        seed+=200
-
-    print("DONE",len(found))
+    seedmine_main(["tripeaks", *sys.argv[1:]])
 
 if __name__=="__main__":
     main()
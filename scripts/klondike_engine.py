@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+Compact Klondike solver state.
+
+Cards are small ints `suit * 13 + (value - 1)` (the same ids as `Card.id` in
+generate_klondike_seeds.py), every pile is a `bytearray` and the foundations
+are four height counters. Cloning a node is a dozen buffer copies instead of a
+deep copy of frozen dataclasses, and all rule checks are table lookups.
+
+Deals, move ordering and state identity match the dataclass model exactly, so
+`solve` returns the same verdicts (and node counts) as the original solver.
+Each state carries its Zobrist key, updated incrementally by `make_move`;
+the solver walks one mutable state with `make_move`/`unmake_move`.
+`best_first` is an alternative heuristic-guided search that returns the
+winning move list.
+"""
+
+import heapq
+from typing import List, Optional, Tuple, Union
+
+import transposition
+from dfs import SearchResult
+from shared_rng import shuffle_with_seed
+from zobrist import ZobristTable
+
+# ---------- Card tables ----------
+
+ACE = 1
+KING = 13
+
+# suit order HEARTS, DIAMONDS, CLUBS, SPADES => ids 0..25 are red
+VALUE = bytes(c % 13 + 1 for c in range(52))
+SUIT = bytes(c // 13 for c in range(52))
+RED = tuple(c < 26 for c in range(52))
+
+# CAN_STACK[moving * 52 + target]: moving card may be placed on target card
+CAN_STACK = bytes(
+    1 if VALUE[m] + 1 == VALUE[t] and RED[m] != RED[t] else 0
+    for m in range(52)
+    for t in range(52)
+)
+
+# ---------- Moves ----------
+
+# A move is a tuple (kind, from_col, start_index, to_col); unused fields are -1.
+# For the two waste kinds a positive start_index is a draw macro: turn the
+# stock that many times (recycling as DRAW does), then play the new waste top.
+TABLEAU_TO_FOUNDATION = 0
+WASTE_TO_FOUNDATION = 1
+TABLEAU_TO_TABLEAU = 2
+WASTE_TO_TABLEAU = 3
+DRAW = 4
+
+Move = Tuple[int, int, int, int]
+
+# A draw macro's rewind: (card played, stock, waste as they were before it).
+MacroRewind = Tuple[int, bytearray, bytearray]
+
+# (move, flipped_hidden_card, card_or_count, previous_key); see `make_move`.
+# For a draw macro the third field is its `MacroRewind` instead.
+Undo = Tuple[Move, bool, Union[int, MacroRewind], int]
+
+# ---------- Zobrist layout ----------
+
+# A revealed column is always one descending alternating run, so never > 13.
+HIDDEN_DEPTH = 7
+REVEALED_DEPTH = 13
+STOCK_DEPTH = 24
+
+HIDDEN_SLOT = 0
+REVEALED_SLOT = HIDDEN_SLOT + 7 * HIDDEN_DEPTH
+STOCK_SLOT = REVEALED_SLOT + 7 * REVEALED_DEPTH
+WASTE_SLOT = STOCK_SLOT + STOCK_DEPTH
+FOUNDATION_SLOT = WASTE_SLOT + STOCK_DEPTH
+ZOBRIST_SLOTS = FOUNDATION_SLOT + 13
+
+ZOBRIST = ZobristTable(ZOBRIST_SLOTS, 52, salt=0x4B4C)
+_KEYS = ZOBRIST.keys
+
+
+def _key(slot: int, card: int) -> int:
+    return _KEYS[slot * 52 + card]
+
+
+# ---------- State ----------
+
+
+class KlondikeState:
+    __slots__ = (
+        "hidden",
+        "revealed",
+        "stock",
+        "waste",
+        "foundations",
+        "draw_amount",
+        "key",
+    )
+
+    def __init__(
+        self,
+        hidden: List[bytearray],
+        revealed: List[bytearray],
+        stock: bytearray,
+        waste: bytearray,
+        foundations: bytearray,
+        draw_amount: int,
+        key: int = 0,
+    ):
+        self.hidden = hidden
+        self.revealed = revealed
+        self.stock = stock
+        self.waste = waste
+        self.foundations = foundations  # height per suit, 0..13
+        self.draw_amount = draw_amount
+        self.key = key
+
+    def clone(self) -> "KlondikeState":
+        return KlondikeState(
+            [bytearray(col) for col in self.hidden],
+            [bytearray(col) for col in self.revealed],
+            bytearray(self.stock),
+            bytearray(self.waste),
+            bytearray(self.foundations),
+            self.draw_amount,
+            self.key,
+        )
+
+    @property
+    def is_victory(self) -> bool:
+        return sum(self.foundations) == 52
+
+
+def initial_state(
+    seed: int, draw_amount: int = 1, aces_at_bottom: bool = False
+) -> KlondikeState:
+    """Deal exactly like `initial_state_from_seed` in generate_klondike_seeds.py."""
+    deck = list(range(52))
+    shuffle_with_seed(deck, seed)
+
+    aces = [c for c in deck if VALUE[c] == ACE]
+    if aces_at_bottom:
+        deck = [c for c in deck if VALUE[c] != ACE]
+
+    hidden: List[bytearray] = []
+    from_index = 0
+    for i in range(7):
+        column = bytearray()
+        if aces_at_bottom and i >= 3 and aces:
+            column.append(aces.pop(0))
+            take = i - 1
+        else:
+            take = i
+        column.extend(deck[from_index : from_index + take])
+        from_index += take
+        hidden.append(column)
+
+    revealed = [bytearray((c,)) for c in deck[from_index : from_index + 7]]
+    stock = bytearray(deck[from_index + 7 :])
+
+    state = KlondikeState(
+        hidden, revealed, stock, bytearray(), bytearray(4), draw_amount
+    )
+    state.key = full_hash(state)
+    return state
+
+
+# ---------- Rules ----------
+
+
+def can_complete(state: KlondikeState, card: int) -> bool:
+    return state.foundations[SUIT[card]] + 1 == VALUE[card]
+
+
+def can_move_onto(state: KlondikeState, moving_top: int, target_col_idx: int) -> bool:
+    target_col = state.revealed[target_col_idx]
+    if not target_col:
+        return VALUE[moving_top] == KING
+    return CAN_STACK[moving_top * 52 + target_col[-1]] == 1
+
+
+def movable_run_start(col: bytearray) -> int:
+    """Index of the deepest card starting a descending, alternating run to the top."""
+    i = len(col) - 1
+    while i > 0 and CAN_STACK[col[i] * 52 + col[i - 1]]:
+        i -= 1
+    return i
+
+
+def safe_to_foundation(foundations: bytearray, card: int) -> bool:
+    """
+    True if nothing could still need `card` as a tableau target: both
+    opposite-colour foundations already hold value - 1 (aces and twos are
+    always safe). Playing such a card to its foundation never loses a win.
+    """
+    value = VALUE[card]
+    if value <= 2:
+        return True
+    if RED[card]:
+        return foundations[2] >= value - 1 and foundations[3] >= value - 1
+    return foundations[0] >= value - 1 and foundations[1] >= value - 1
+
+
+def _flip_if_needed(state: KlondikeState, col_idx: int) -> bool:
+    hidden = state.hidden[col_idx]
+    if not state.revealed[col_idx] and hidden:
+        card = hidden.pop()
+        state.revealed[col_idx].append(card)
+        state.key ^= _key(
+            HIDDEN_SLOT + col_idx * HIDDEN_DEPTH + len(hidden), card
+        ) ^ _key(REVEALED_SLOT + col_idx * REVEALED_DEPTH, card)
+        return True
+    return False
+
+
+def reachable_waste(state: KlondikeState) -> List[Tuple[int, int]]:
+    """
+    (draws, card) for every waste top reachable by turning the stock: the
+    rest of this pass, then one full pass after recycling (later passes
+    repeat it). Positions are told apart by waste length, which with the
+    card order fixed between plays identifies the stock/waste split.
+    """
+    stock = bytearray(state.stock)
+    waste = bytearray(state.waste)
+    seen = {len(waste)}
+    out: List[Tuple[int, int]] = []
+    draws = 0
+    recycled = False
+    while stock or (waste and not recycled):
+        draws += 1
+        if not stock:
+            waste.reverse()
+            stock, waste = waste, stock
+            recycled = True
+            continue
+        for _ in range(min(state.draw_amount, len(stock))):
+            waste.append(stock.pop())
+        if len(waste) not in seen:
+            seen.add(len(waste))
+            out.append((draws, waste[-1]))
+    return out
+
+
+def generate_moves(
+    state: KlondikeState, prune: bool = False, macros: bool = False
+) -> List[Move]:
+    """
+    Return moves ordered roughly from 'good' to 'less good'.
+
+    With `prune`, a safe foundation move (see `safe_to_foundation`) is
+    returned as the only move, and moves that only permute columns are
+    dropped: a whole face-up column moving to an empty column, and moves
+    into any empty column but the first. Neither loses a win, so an
+    exhausted pruned search is still a proof.
+
+    With `macros`, DRAW is replaced by one move per play of a card further
+    down the stock cycle (see `reachable_waste`), so cycling the stock costs
+    a single expansion. Draws that are never followed by a play cannot
+    matter to a win, so nothing is lost.
+    """
+    foundation_moves: List[Move] = []
+    reveal_moves: List[Move] = []
+    other_moves: List[Move] = []
+
+    revealed = state.revealed
+    foundations = state.foundations
+
+    # tableau -> foundation
+    for col_idx in range(7):
+        col = revealed[col_idx]
+        if col:
+            card = col[-1]
+            if foundations[SUIT[card]] + 1 == VALUE[card]:
+                move = (TABLEAU_TO_FOUNDATION, col_idx, -1, -1)
+                if prune and safe_to_foundation(foundations, card):
+                    return [move]
+                foundation_moves.append(move)
+
+    # waste -> foundation (forcing it is only safe when draws are single
+    # cards: with draw-3 removing a waste card regroups later passes)
+    waste = state.waste
+    if waste:
+        card = waste[-1]
+        if foundations[SUIT[card]] + 1 == VALUE[card]:
+            move = (WASTE_TO_FOUNDATION, -1, -1, -1)
+            if (
+                prune
+                and state.draw_amount == 1
+                and safe_to_foundation(foundations, card)
+            ):
+                return [move]
+            foundation_moves.append(move)
+
+    # with `prune`, only the first empty column is a target
+    first_empty = -1
+    if prune:
+        for col_idx in range(7):
+            if not revealed[col_idx] and not state.hidden[col_idx]:
+                first_empty = col_idx
+                break
+
+    # tableau sequences -> tableau
+    for from_idx in range(7):
+        source = revealed[from_idx]
+        if not source:
+            continue
+        has_hidden = len(state.hidden[from_idx]) > 0
+        for start_idx in range(movable_run_start(source), len(source)):
+            moving_top = source[start_idx]
+            for to_idx in range(7):
+                if to_idx == from_idx:
+                    continue
+                if not can_move_onto(state, moving_top, to_idx):
+                    continue
+                if (
+                    prune
+                    and not revealed[to_idx]
+                    and (to_idx != first_empty or (start_idx == 0 and not has_hidden))
+                ):
+                    continue
+                m = (TABLEAU_TO_TABLEAU, from_idx, start_idx, to_idx)
+                if start_idx == 0 and has_hidden:
+                    reveal_moves.append(m)
+                else:
+                    other_moves.append(m)
+
+    # waste -> tableau
+    if waste:
+        top = waste[-1]
+        for to_idx in range(7):
+            if prune and not revealed[to_idx] and to_idx != first_empty:
+                continue
+            if can_move_onto(state, top, to_idx):
+                other_moves.append((WASTE_TO_TABLEAU, -1, -1, to_idx))
+
+    # draw / recycle
+    if macros:
+        for draws, card in reachable_waste(state):
+            if foundations[SUIT[card]] + 1 == VALUE[card]:
+                other_moves.append((WASTE_TO_FOUNDATION, -1, draws, -1))
+            for to_idx in range(7):
+                if prune and not revealed[to_idx] and to_idx != first_empty:
+                    continue
+                if can_move_onto(state, card, to_idx):
+                    other_moves.append((WASTE_TO_TABLEAU, -1, draws, to_idx))
+    elif state.stock or waste:
+        other_moves.append((DRAW, -1, -1, -1))
+
+    return foundation_moves + reveal_moves + other_moves
+
+
+def _turn_stock(state: KlondikeState, key: int) -> Tuple[int, int]:
+    """One DRAW: turn up to draw_amount cards, or recycle an empty stock (-1)."""
+    stock, waste = state.stock, state.waste
+    if not stock:
+        key ^= ZOBRIST.pile_key(WASTE_SLOT, waste) ^ ZOBRIST.pile_key(
+            STOCK_SLOT, reversed(waste)
+        )
+        waste.reverse()
+        state.stock, state.waste = waste, stock
+        return key, -1
+    count = min(state.draw_amount, len(stock))
+    for _ in range(count):
+        card = stock.pop()
+        key ^= _key(STOCK_SLOT + len(stock), card) ^ _key(WASTE_SLOT + len(waste), card)
+        waste.append(card)
+    return key, count
+
+
+def make_move(state: KlondikeState, move: Move) -> Undo:
+    """Apply `move` to `state` in place and return the record `unmake_move` needs."""
+    kind, from_col, start_index, to_col = move
+    old_key = key = state.key
+    extra = 0
+    saved = None
+    if start_index > 0 and (kind == WASTE_TO_FOUNDATION or kind == WASTE_TO_TABLEAU):
+        saved = bytearray(state.stock), bytearray(state.waste)
+        for _ in range(start_index):
+            key, _ = _turn_stock(state, key)
+    if kind == TABLEAU_TO_FOUNDATION:
+        source = state.revealed[from_col]
+        card = extra = source.pop()
+        key ^= _key(
+            REVEALED_SLOT + from_col * REVEALED_DEPTH + len(source), card
+        ) ^ _key(FOUNDATION_SLOT + VALUE[card] - 1, card)
+        state.foundations[SUIT[card]] += 1
+    elif kind == WASTE_TO_FOUNDATION:
+        card = extra = state.waste.pop()
+        key ^= _key(WASTE_SLOT + len(state.waste), card) ^ _key(
+            FOUNDATION_SLOT + VALUE[card] - 1, card
+        )
+        state.foundations[SUIT[card]] += 1
+    elif kind == TABLEAU_TO_TABLEAU:
+        source = state.revealed[from_col]
+        target = state.revealed[to_col]
+        from_slot = REVEALED_SLOT + from_col * REVEALED_DEPTH + start_index
+        to_slot = REVEALED_SLOT + to_col * REVEALED_DEPTH + len(target)
+        for i, card in enumerate(source[start_index:]):
+            key ^= _key(from_slot + i, card) ^ _key(to_slot + i, card)
+        extra = len(source) - start_index
+        target += source[start_index:]
+        del source[start_index:]
+    elif kind == WASTE_TO_TABLEAU:
+        card = state.waste.pop()
+        target = state.revealed[to_col]
+        key ^= _key(WASTE_SLOT + len(state.waste), card) ^ _key(
+            REVEALED_SLOT + to_col * REVEALED_DEPTH + len(target), card
+        )
+        target.append(card)
+    elif kind == DRAW:
+        key, extra = _turn_stock(state, key)
+    else:
+        raise ValueError(f"Unknown move kind: {kind}")
+    if saved is not None:
+        extra = (extra, *saved)
+    state.key = key
+    flipped = (
+        kind == TABLEAU_TO_FOUNDATION or kind == TABLEAU_TO_TABLEAU
+    ) and _flip_if_needed(state, from_col)
+    return move, flipped, extra, old_key
+
+
+def unmake_move(state: KlondikeState, undo: Undo) -> None:
+    """Revert the `make_move` that returned `undo`."""
+    (kind, from_col, start_index, to_col), flipped, extra, old_key = undo
+    if flipped:
+        state.hidden[from_col].append(state.revealed[from_col].pop())
+    if kind == TABLEAU_TO_FOUNDATION:
+        state.foundations[SUIT[extra]] -= 1
+        state.revealed[from_col].append(extra)
+    elif kind == WASTE_TO_FOUNDATION:
+        if start_index > 0:
+            extra, state.stock, state.waste = extra
+        else:
+            state.waste.append(extra)
+        state.foundations[SUIT[extra]] -= 1
+    elif kind == TABLEAU_TO_TABLEAU:
+        target = state.revealed[to_col]
+        state.revealed[from_col] += target[-extra:]
+        del target[-extra:]
+    elif kind == WASTE_TO_TABLEAU:
+        card = state.revealed[to_col].pop()
+        if start_index > 0:
+            _, state.stock, state.waste = extra
+        else:
+            state.waste.append(card)
+    elif kind == DRAW:
+        stock, waste = state.stock, state.waste
+        if extra < 0:
+            stock.reverse()
+            state.stock, state.waste = waste, stock
+        else:
+            for _ in range(extra):
+                stock.append(waste.pop())
+    state.key = old_key
+
+
+def apply_move(state: KlondikeState, move: Move) -> KlondikeState:
+    s = state.clone()
+    make_move(s, move)
+    return s
+
+
+# ---------- State hashing ----------
+
+
+def full_hash(state: KlondikeState) -> int:
+    """Zobrist key of `state` computed from scratch."""
+    h = 0
+    for col_idx in range(7):
+        h ^= ZOBRIST.pile_key(
+            HIDDEN_SLOT + col_idx * HIDDEN_DEPTH, state.hidden[col_idx]
+        )
+        h ^= ZOBRIST.pile_key(
+            REVEALED_SLOT + col_idx * REVEALED_DEPTH, state.revealed[col_idx]
+        )
+    h ^= ZOBRIST.pile_key(STOCK_SLOT, state.stock)
+    h ^= ZOBRIST.pile_key(WASTE_SLOT, state.waste)
+    for suit, height in enumerate(state.foundations):
+        h ^= ZOBRIST.pile_key(FOUNDATION_SLOT, range(suit * 13, suit * 13 + height))
+    return h
+
+
+def hash_state(state: KlondikeState) -> int:
+    return state.key
+
+
+# ---------- Solver ----------
+
+
+def solve(
+    seed: int,
+    draw_amount: int = 1,
+    aces_at_bottom: bool = False,
+    node_limit: int = 200_000,
+    prune: bool = False,
+    macros: bool = False,
+) -> SearchResult:
+    """
+    DFS over a single mutable state. `frames[i]` holds the unexplored children
+    of the i-th node on the current path and `undos[i - 1]` the move that led
+    to it; children are marked visited when generated (as the copying solver
+    did), so they only ever exist as Zobrist keys until they are entered.
+    """
+    state = initial_state(seed, draw_amount, aces_at_bottom)
+    visited = transposition.new_visited()
+    visited.add(state.key)
+    frames: List[List[Move]] = []
+    undos: List[Undo] = []
+    nodes = 0
+
+    while node_limit > nodes:
+        if frames:
+            pending = frames[-1]
+            if not pending:
+                frames.pop()
+                if undos:
+                    unmake_move(state, undos.pop())
+                if not frames:
+                    return SearchResult(False, nodes, exhausted=True)
+                continue
+            undos.append(make_move(state, pending.pop()))
+        nodes += 1
+
+        if state.is_victory:
+            return SearchResult(True, nodes, len(undos))
+
+        children: List[Move] = []
+        for m in generate_moves(state, prune, macros):
+            undo = make_move(state, m)
+            key = state.key
+            unmake_move(state, undo)
+            if key not in visited:
+                visited.add(key)
+                children.append(m)
+        frames.append(children)
+
+    return SearchResult(False, nodes)
+
+
+# ---------- Best-first solver ----------
+
+
+def heuristic(state: KlondikeState) -> int:
+    """
+    Cards still off the foundations (each needs at least one move), plus
+    face-down cards, plus how deeply each suit's next foundation card is buried.
+    """
+    foundations = state.foundations
+    needed = {
+        suit * 13 + height for suit, height in enumerate(foundations) if height < 13
+    }
+    h = 52 - sum(foundations)
+    for col_idx in range(7):
+        hidden = state.hidden[col_idx]
+        revealed = state.revealed[col_idx]
+        h += len(hidden)
+        above = len(revealed) + len(hidden)
+        for card in hidden:
+            above -= 1
+            if card in needed:
+                h += above
+        for i, card in enumerate(revealed):
+            if card in needed:
+                h += len(revealed) - 1 - i
+    return h
+
+
+def best_first(
+    seed: int,
+    draw_amount: int = 1,
+    aces_at_bottom: bool = False,
+    node_limit: int = 200_000,
+    weight: int = 10,
+    max_open: int = 50_000,
+    prune: bool = False,
+    macros: bool = False,
+) -> Tuple[SearchResult, Optional[List[Move]]]:
+    """
+    Weighted A*: expand the open state with the lowest `depth + weight *
+    heuristic`. Each pushed state records (parent entry, move) in `trail`, so
+    a win comes back as the move list that replays it from `initial_state`.
+    When more than `max_open` states are queued the worse half is dropped,
+    and `trail` is cut down to the survivors' ancestors; an unsolved search
+    that ever dropped states is not a proof. `visited` still grows with the
+    node count unless the process has a `transposition` budget.
+    """
+    root = initial_state(seed, draw_amount, aces_at_bottom)
+    visited = transposition.new_visited()
+    visited.add(root.key)
+    trail: List[Tuple[int, Move]] = []
+    # (priority, tie-break, depth, state, trail index of the move into it)
+    open_states = [(weight * heuristic(root), 0, 0, root, -1)]
+    pushed = 1
+    nodes = 0
+    trimmed = False
+
+    while open_states:
+        if nodes >= node_limit:
+            return SearchResult(False, nodes), None
+        _, _, depth, state, at = heapq.heappop(open_states)
+        nodes += 1
+        if state.is_victory:
+            path: List[Move] = []
+            while at >= 0:
+                at, move = trail[at]
+                path.append(move)
+            path.reverse()
+            return SearchResult(True, nodes, depth), path
+
+        for move in generate_moves(state, prune, macros):
+            undo = make_move(state, move)
+            if state.key not in visited:
+                visited.add(state.key)
+                trail.append((at, move))
+                heapq.heappush(
+                    open_states,
+                    (
+                        depth + 1 + weight * heuristic(state),
+                        pushed,
+                        depth + 1,
+                        state.clone(),
+                        len(trail) - 1,
+                    ),
+                )
+                pushed += 1
+            unmake_move(state, undo)
+
+        if len(open_states) > max_open:
+            open_states = heapq.nsmallest(max_open // 2, open_states)
+            trail, open_states = _prune_trail(trail, open_states)
+            trimmed = True
+
+    return SearchResult(False, nodes, exhausted=not trimmed), None
+
+
+def _prune_trail(
+    trail: List[Tuple[int, Move]], open_states: list
+) -> Tuple[List[Tuple[int, Move]], list]:
+    """
+    Keep only the trail entries on the paths to `open_states`, renumbered;
+    the open list stays a heap.
+    """
+    live = set()
+    for entry in open_states:
+        at = entry[-1]
+        while at >= 0 and at not in live:
+            live.add(at)
+            at = trail[at][0]
+    # a parent is always pushed before its children, so ascending order keeps
+    # parents first
+    renumbered = {old: new for new, old in enumerate(sorted(live))}
+    kept = [(renumbered.get(trail[old][0], -1), trail[old][1]) for old in sorted(live)]
+    return kept, [
+        entry[:-1] + (renumbered.get(entry[-1], -1),) for entry in open_states
+    ]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Cheap checks run before a game's full search.
+
+A game's `screen` first applies static necessary conditions to the deal
+(a failing deal is provably unsolvable and is rejected with zero nodes), then
+tries a few bounded greedy playouts over the same `make_move`/`unmake_move`
+board the DFS walks. A playout that wins settles an easy seed without the
+expensive search; anything else falls through to the solver.
+"""
+import random
+from typing import Any, Callable, List, Optional, Set
+
+from dfs import SearchResult
+
+# A deal that a necessary-condition check has proven unsolvable.
+DEAD = SearchResult(False, 0, exhausted=True)
+
+
+def _follows(rollover: bool):
+    return tuple(tuple(top == 0 or abs(top - r) == 1 or (rollover and {top, r} == {1, 13})
+                       for r in range(14)) for top in range(14))
+
+
+# Golf and TriPeaks: FOLLOWS[rollover][top][r] says a card of rank r may be
+# played onto top rank `top` (0 = nothing played yet); with rollover, Ace and
+# King are neighbours.
+FOLLOWS = {True: _follows(True), False: _follows(False)}
+
+
+def neighbour_ranks(r: int, rollover: bool) -> Set[int]:
+    """Ranks a card of rank `r` can be played onto, or take onto itself, in Golf and TriPeaks."""
+    ranks = {r - 1, r + 1} & set(range(1, 14))
+    if rollover and r in (1, 13):
+        ranks.add(14 - r)
+    return ranks
+
+
+def greedy_playouts(board: Any,
+                    generate_moves: Callable[[Any], List[Any]],
+                    make_move: Callable[[Any, Any], Any],
+                    unmake_move: Callable[[Any, Any], None],
+                    is_won: Callable[[Any], bool],
+                    score: Callable[[Any, Any], float],
+                    tries: int = 8,
+                    max_moves: int = 500,
+                    noise: float = 1.0,
+                    seed: int = 0) -> Optional[SearchResult]:
+    """
+    Play the best-scoring move until the game is won or stuck. The first try
+    is purely greedy; later ones add up to `noise` of random jitter to each
+    score (seeded, so a deal always screens the same way). Returns the win
+    (nodes = moves played over all tries) or None; the board is restored.
+    """
+    rng = random.Random(seed)
+    nodes = 0
+    for attempt in range(tries):
+        jitter = noise if attempt else 0.0
+        undos = []
+        won = False
+        while True:
+            if is_won(board):
+                won = True
+                break
+            moves = generate_moves(board) if len(undos) < max_moves else None
+            if not moves:
+                break
+            best = max(moves, key=lambda m: score(board, m) + jitter * rng.random())
+            undos.append(make_move(board, best))
+            nodes += 1
+        length = len(undos)
+        while undos:
+            unmake_move(board, undos.pop())
+        if won:
+            return SearchResult(True, nodes, length)
+    return None
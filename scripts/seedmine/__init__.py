@@ -0,0 +1,5 @@
+"""Seed mining for the solitaire games: one CLI and scheduler for every registered solver."""
+from .registry import GameSpec, get_game, game_names, register_game
+from .scheduler import MiningJob, mine
+
+__all__ = ["GameSpec", "MiningJob", "game_names", "get_game", "mine", "register_game"]
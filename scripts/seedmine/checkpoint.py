@@ -0,0 +1,74 @@
+"""
+Resumable seed cursor.
+
+`<seed file>.checkpoint` records the highest seed below which every seed has
+been evaluated, plus the evaluated seeds above it as ranges. Anything between
+that cursor and the highest evaluated seed was in flight when the run stopped;
+a restarted run re-dispatches exactly those gaps and then carries on after
+the highest evaluated seed, instead of re-solving from the last winner.
+"""
+import json
+import os
+from collections import deque
+from typing import Deque, List, Set
+
+
+class SeedCursor:
+    def __init__(self, path: str):
+        self.path = path
+        self.contiguous = 0  # every seed below this has been evaluated
+        self.completed: Set[int] = set()  # evaluated seeds at or above `contiguous`
+        self.next_seed = 0  # lowest seed never dispatched
+        self.retry: Deque[int] = deque()  # in flight when an earlier run stopped
+
+    def load(self) -> bool:
+        """Restore the cursor; False if there is no usable checkpoint."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            contiguous = int(data["contiguous"])
+            completed = {s for lo, hi in data.get("completed", []) for s in range(int(lo), int(hi) + 1)}
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self.contiguous = contiguous
+        self.completed = completed
+        self.next_seed = max(completed) + 1 if completed else contiguous
+        self.retry = deque(s for s in range(contiguous, self.next_seed) if s not in completed)
+        return True
+
+    def start_at(self, seed: int) -> None:
+        """Treat every seed below `seed` as evaluated (used when no checkpoint exists)."""
+        self.contiguous = self.next_seed = seed
+        self.completed.clear()
+        self.retry.clear()
+
+    def take(self) -> int:
+        if self.retry:
+            return self.retry.popleft()
+        seed = self.next_seed
+        self.next_seed += 1
+        return seed
+
+    def complete(self, seed: int) -> None:
+        if seed < self.contiguous:
+            return
+        self.completed.add(seed)
+        while self.contiguous in self.completed:
+            self.completed.remove(self.contiguous)
+            self.contiguous += 1
+
+    def _ranges(self) -> List[List[int]]:
+        ranges: List[List[int]] = []
+        for s in sorted(self.completed):
+            if ranges and ranges[-1][1] + 1 == s:
+                ranges[-1][1] = s
+            else:
+                ranges.append([s, s])
+        return ranges
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"contiguous": self.contiguous, "completed": self._ranges()}, f,
+                      separators=(",", ":"))
+        os.replace(tmp, self.path)
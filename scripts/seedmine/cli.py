@@ -0,0 +1,87 @@
+"""
+Command line entry point: `python -m seedmine <game> [<game> ...] [options]`.
+
+Run from the `scripts/` directory. Common flags apply to every game named on
+the command line; game-specific flags come from each game's registration and
+are ignored by games that do not declare them.
+"""
+import argparse
+from typing import List, Optional
+
+from .registry import game_names, get_game, option_dest
+from .scheduler import MiningJob, mine
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="seedmine", description="Mine solvable deal seeds.")
+    ap.add_argument("games", nargs="+", choices=game_names(), metavar="game",
+                    help=f"one or more of: {', '.join(game_names())}")
+    ap.add_argument("--out", default=None,
+                    help="seed file (only with a single game; defaults to the game's asset name)")
+    ap.add_argument("--target", type=int, default=None,
+                    help="seeds to find per game (defaults to the game's own target)")
+    ap.add_argument("--node-limit", type=int, default=200_000)
+    ap.add_argument("--mode", choices=("heuristic", "exact"), default="heuristic",
+                    help="heuristic gives up at --node-limit; exact searches every seed until it "
+                         "is solved or proven unsolvable (proofs are cached in --results-dir)")
+    ap.add_argument("--table-mb", type=float, default=None,
+                    help="cap each worker's visited set at this many MiB (positions beyond it may be "
+                         "searched again; heuristic mode only; default: unbounded)")
+    ap.add_argument("--chunksize", type=int, default=4,
+                    help="seeds handed to a worker at a time (small keeps slow seeds from stalling others)")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="also report rejected seeds")
+    ap.add_argument("--results-dir", default="seed_results",
+                    help="where every solve outcome is recorded and looked up before solving")
+    ap.add_argument("--compact", action="store_true",
+                    help="fold leftover journals into the seed files and exit without mining")
+
+    seen = set()
+    for name in game_names():
+        spec = get_game(name)
+        group = ap.add_argument_group(f"{name} options")
+        for flag, kwargs in spec.options.items():
+            # Games may share a flag (e.g. --aces-at-bottom); declare it once.
+            if flag in seen:
+                continue
+            seen.add(flag)
+            group.add_argument(flag, **kwargs)
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    games = list(dict.fromkeys(args.games))
+    if args.out is not None and len(games) > 1:
+        ap.error("--out can only be used with a single game")
+    if args.table_mb and args.mode == "exact":
+        # an evicted position can be re-expanded forever without a node limit
+        ap.error("--table-mb cannot be used with --mode exact")
+
+    jobs = []
+    for name in games:
+        spec = get_game(name)
+        options = {option_dest(flag): getattr(args, option_dest(flag)) for flag in spec.options}
+        if (args.mode == "exact" and spec.proves_unsolvable is not None
+                and not spec.proves_unsolvable(options)):
+            # it would search without a node limit and still end "unknown"
+            ap.error(f"--mode exact: the {name} solver cannot prove a deal unsolvable with these options")
+        jobs.append(MiningJob(
+            spec=spec,
+            out=args.out or spec.default_out,
+            target=args.target if args.target is not None else spec.default_target,
+            node_limit=args.node_limit,
+            options=options,
+            results_dir=args.results_dir,
+            exact=args.mode == "exact",
+        ))
+
+    if args.compact:
+        for job in jobs:
+            job.journal.compact(job.journal.load())
+            print(f"[{job.spec.name}] Compacted {job.out}")
+        return
+
+    mine(jobs, workers=args.workers, chunksize=args.chunksize, verbose=args.verbose,
+         table_mb=args.table_mb)
@@ -0,0 +1,73 @@
+"""
+Append-only journal of found seeds.
+
+Finds are appended as one JSON line each to `<seed file>.journal` (flushed per
+record, fsync'ed in batches) instead of re-sorting and rewriting the whole
+seed file per hit. `compact` folds the journal into the sorted seed file with
+an atomic replace; it runs when mining stops and can be run on demand with
+`python -m seedmine <game> --compact`. A killed run leaves at worst a torn
+last journal line, which `load` skips.
+"""
+import json
+import os
+import time
+from typing import IO, Optional, Set
+
+from .seedfile import load_seeds, save_seeds
+
+
+class SeedJournal:
+    def __init__(self, out: str, sync_every: int = 64, sync_interval_s: float = 5.0):
+        self.out = out
+        self.path = out + ".journal"
+        self.sync_every = sync_every
+        self.sync_interval_s = sync_interval_s
+        self._file: Optional[IO[str]] = None
+        self._unsynced = 0
+        self._appended = False
+        self._last_sync = time.monotonic()
+
+    def load(self) -> Set[int]:
+        """Seeds in the seed file plus any journaled by earlier, uncompacted runs."""
+        seeds = load_seeds(self.out)
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        seeds.add(int(json.loads(line)["seed"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn write from a killed run
+        return seeds
+
+    def append(self, seed: int, bucket: str, nodes: int) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({"seed": seed, "bucket": bucket, "nodes": nodes},
+                                    separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._appended = True
+        self._unsynced += 1
+        if (self._unsynced >= self.sync_every or
+                time.monotonic() - self._last_sync >= self.sync_interval_s):
+            self.sync()
+
+    def sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def compact(self, seeds: Set[int]) -> None:
+        """Write `seeds` to the seed file atomically, then drop the journal."""
+        self.close()
+        if not self._appended and not os.path.exists(self.path):
+            return  # nothing new; leave the asset byte-for-byte untouched
+        save_seeds(self.out, seeds)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
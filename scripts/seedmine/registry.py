@@ -0,0 +1,91 @@
+"""
+Game-solver registry.
+
+Each `generate_<game>_seeds.py` module registers a `GameSpec` describing how
+to solve and classify one seed of its game; `load_games` imports those
+modules on first use so the CLI and scheduler only ever see the registry.
+"""
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from dfs import SearchResult
+
+# Modules that register games when imported.
+GAME_MODULES = (
+    "generate_klondike_seeds",
+    "generate_spider_seeds",
+    "generate_pyramid_seeds",
+    "generate_tripeaks_seeds",
+    "generate_golf_seeds",
+    "generate_freecell_seeds",
+)
+
+Options = Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    name: str
+    # solve(seed, node_limit, options) -> dfs.SearchResult; must be picklable
+    solve: Callable[[int, int, Options], SearchResult]
+    # classify(result, options) -> difficulty bucket, or None to reject the seed
+    classify: Callable[[SearchResult, Options], Optional[str]]
+    default_out: str
+    default_target: int = 365
+    # extra CLI flags: flag -> argparse.add_argument kwargs (must include "default")
+    options: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # option dests that change the deal, rules or search (not just classification)
+    variant_options: Tuple[str, ...] = ()
+    # screen(seed, options) -> SearchResult settling the seed without `solve`
+    # (screening.DEAD, or a quick playout win), or None to run the full solve.
+    # Only for games whose `classify` does not grade wins by solver nodes.
+    screen: Optional[Callable[[int, Options], Optional[SearchResult]]] = None
+    # node_cap(options) -> most nodes a win `classify` accepts may take; the
+    # job's node limit is lowered to it so hopeless searches stop early
+    node_cap: Optional[Callable[[Options], int]] = None
+    # proves_unsolvable(options) -> whether `solve` can end exhausted (a proof)
+    # with these options, as `--mode exact` needs; None means it always can
+    proves_unsolvable: Optional[Callable[[Options], bool]] = None
+    # deals come from `shared_rng.shuffled_deck(seed, deck_size)`: the miner
+    # then deals whole runs of seeds with `deal_batch` and presets each deck
+    deck_size: Optional[int] = None
+    # bump when solve() changes its node counts, so stored results are not reused
+    solver_version: int = 1
+
+
+_GAMES: Dict[str, GameSpec] = {}
+_loaded = False
+
+
+def option_dest(flag: str) -> str:
+    return flag.lstrip("-").replace("-", "_")
+
+
+def register_game(spec: GameSpec) -> GameSpec:
+    # Re-registration is expected when a generator runs as __main__ and is
+    # imported again by `load_games`.
+    _GAMES[spec.name] = spec
+    return spec
+
+
+def load_games() -> None:
+    global _loaded
+    if _loaded:
+        return
+    for module in GAME_MODULES:
+        importlib.import_module(module)
+    _loaded = True
+
+
+def get_game(name: str) -> GameSpec:
+    load_games()
+    try:
+        return _GAMES[name]
+    except KeyError:
+        raise ValueError(f"Unknown game: {name}") from None
+
+
+def game_names() -> List[str]:
+    load_games()
+    return sorted(_GAMES)
@@ -0,0 +1,96 @@
+"""
+Columnar store of every solve outcome.
+
+Each (game, variant, solver version) gets one append-only file of fixed-size
+NumPy records under the results directory, read back with `np.memmap`. The
+scheduler consults it before dispatching a seed: a stored win or proven
+loss, or a give-up at an equal or higher node limit, is reused instead of
+re-solving, so re-tuning a game's `classify` thresholds re-derives buckets
+from the stored stats and dead deals are never searched again. A torn final
+record from a killed run is ignored on load.
+"""
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from dfs import SOLVED, UNKNOWN, UNSOLVABLE, SearchResult
+
+from .registry import GameSpec, Options
+
+# `verdict` column codes; 0 and 1 match the earlier boolean `solved` column
+VERDICT_CODES = {UNKNOWN: 0, SOLVED: 1, UNSOLVABLE: 2}
+MAX_NODE_LIMIT = 0xFFFFFFFF  # stored for exact (unlimited) searches
+
+RESULT_DTYPE = np.dtype([
+    ("seed", "<u8"),
+    ("verdict", "u1"),
+    ("nodes", "<u4"),
+    ("node_limit", "<u4"),
+    ("solution_length", "<u2"),
+    ("wall_ms", "<f4"),
+])
+
+
+def results_path(results_dir: str, spec: GameSpec, options: Options) -> str:
+    """One file per game, rule variant (the options that change the deal) and solver version."""
+    parts = [spec.name]
+    for dest in spec.variant_options:
+        value = options[dest]
+        parts.append(f"{dest}={int(value) if isinstance(value, bool) else value}")
+    parts.append(f"v{spec.solver_version}")
+    return os.path.join(results_dir, ".".join(parts) + ".results")
+
+
+class ResultsStore:
+    def __init__(self, path: str, flush_every: int = 256):
+        self.path = path
+        self.flush_every = flush_every
+        self._pending: List[tuple] = []
+        self._seeds = np.empty(0, dtype="<u8")
+        self._records = np.empty(0, dtype=RESULT_DTYPE)
+
+    def load(self) -> int:
+        """Index the stored records; returns how many distinct seeds are known."""
+        if not os.path.exists(self.path):
+            return 0
+        size = os.path.getsize(self.path)
+        count = size // RESULT_DTYPE.itemsize
+        if size % RESULT_DTYPE.itemsize:
+            # drop a torn record so later appends stay aligned
+            os.truncate(self.path, count * RESULT_DTYPE.itemsize)
+        if count == 0:
+            return 0
+        records = np.memmap(self.path, dtype=RESULT_DTYPE, mode="r", shape=(count,))
+        # a seed may be re-solved at a higher node limit; keep its latest record
+        latest = records[::-1]
+        seeds, first = np.unique(latest["seed"], return_index=True)
+        self._seeds = seeds
+        self._records = np.array(latest[first])
+        return len(seeds)
+
+    def lookup(self, seed: int, node_limit: int) -> Optional[SearchResult]:
+        """A stored outcome that solving again at `node_limit` could not change."""
+        i = int(np.searchsorted(self._seeds, seed))
+        if i == len(self._seeds) or self._seeds[i] != seed:
+            return None
+        rec = self._records[i]
+        verdict = int(rec["verdict"])
+        if verdict == VERDICT_CODES[UNKNOWN] and rec["node_limit"] < min(node_limit, MAX_NODE_LIMIT):
+            return None
+        return SearchResult(verdict == VERDICT_CODES[SOLVED], int(rec["nodes"]),
+                            int(rec["solution_length"]), verdict == VERDICT_CODES[UNSOLVABLE])
+
+    def append(self, seed: int, result: SearchResult, node_limit: int, wall_ms: float) -> None:
+        self._pending.append((seed, VERDICT_CODES[result.verdict], min(result.nodes, MAX_NODE_LIMIT),
+                              min(node_limit, MAX_NODE_LIMIT), result.solution_length, wall_ms))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(np.array(self._pending, dtype=RESULT_DTYPE).tobytes())
+        self._pending = []
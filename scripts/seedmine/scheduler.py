@@ -0,0 +1,196 @@
+"""
+Mining scheduler shared by every registered game.
+
+One persistent worker pool solves seeds for any number of `MiningJob`s at
+once. Seeds are streamed into `imap_unordered` from an unbounded round-robin
+feed, so there is no per-batch barrier: a seed that runs to the node limit
+only occupies its own worker while the others keep pulling chunks. Results
+are classified in the parent; winners are appended to each job's journal as
+they arrive and compacted into its seed file when mining stops. Every outcome
+is recorded in the job's `ResultsStore`, and seeds it already answers are
+passed through the pool without being solved again. A game's `screen`, if
+any, runs in the worker first and can settle a seed without the solver.
+Each job's `SeedCursor` is checkpointed so a restarted run resumes exactly
+where it stopped. With `table_mb`, every worker caps its solvers' visited
+sets at that many MiB (see `transposition`). For games that declare a
+`deck_size`, the parent deals runs of seeds in one `deal_batch` call and
+each task carries its deck.
+"""
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pool, cpu_count
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import shared_rng
+import transposition
+from dfs import SearchResult
+
+from .checkpoint import SeedCursor
+from .journal import SeedJournal
+from .registry import GameSpec, Options
+from .results import ResultsStore, results_path
+
+# (game, solve, screen or None, seed, node_limit, options, stored outcome or None, deck or None)
+Task = Tuple[str, Any, Any, int, int, Options, Optional[SearchResult], Optional[bytes]]
+# (game, seed, result, wall_ms, from_store)
+TaskResult = Tuple[str, int, SearchResult, float, bool]
+
+# node limit of an exact job: searches only stop when solved or exhausted
+NO_NODE_LIMIT = sys.maxsize
+
+
+@dataclass
+class MiningJob:
+    spec: GameSpec
+    out: str
+    target: int
+    node_limit: int
+    options: Options
+    results_dir: str = "seed_results"
+    # exact: search every seed to a proof (solved or unsolvable), ignoring
+    # node_limit and the game's node_cap; otherwise give up at the budget
+    exact: bool = False
+    found: Set[int] = field(default_factory=set)
+    journal: SeedJournal = field(init=False)
+    results: ResultsStore = field(init=False)
+    cursor: SeedCursor = field(init=False)
+    dealer: Optional[shared_rng.BatchDealer] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.exact:
+            self.node_limit = NO_NODE_LIMIT
+        elif self.spec.node_cap is not None:
+            self.node_limit = min(self.node_limit, self.spec.node_cap(self.options))
+        self.journal = SeedJournal(self.out)
+        self.cursor = SeedCursor(self.out + ".checkpoint")
+        self.results = ResultsStore(results_path(self.results_dir, self.spec, self.options))
+        self.dealer = shared_rng.BatchDealer(self.spec.deck_size) if self.spec.deck_size else None
+
+    @property
+    def done(self) -> bool:
+        return len(self.found) >= self.target
+
+    def load(self) -> None:
+        self.found = self.journal.load()
+        print(f"[{self.spec.name}] Loaded {len(self.found)} existing seeds from {self.out}")
+        known = self.results.load()
+        if known:
+            print(f"[{self.spec.name}] {known} stored outcomes in {self.results.path}")
+        if self.cursor.load():
+            print(f"[{self.spec.name}] Resuming at seed {self.cursor.next_seed} "
+                  f"({len(self.cursor.retry)} unfinished below it)")
+        elif self.found:
+            # no checkpoint (older runs): assume everything up to the last find was evaluated
+            self.cursor.start_at(max(self.found) + 1)
+
+    def checkpoint(self) -> None:
+        # outcomes must be durable before the cursor claims their seeds are done
+        self.results.flush()
+        self.journal.sync()
+        self.cursor.save()
+
+    def next_task(self) -> Task:
+        seed = self.cursor.take()
+        stored = self.results.lookup(seed, self.node_limit)
+        deck = self.dealer.deck(seed) if self.dealer is not None and stored is None else None
+        spec = self.spec
+        return spec.name, spec.solve, spec.screen, seed, self.node_limit, self.options, stored, deck
+
+
+class SeedFeed:
+    """
+    Endless round-robin stream of tasks over the unfinished jobs.
+
+    `Pool.imap_unordered` drains its iterable eagerly on a background thread,
+    so the feed blocks once `max_in_flight` tasks are queued or running and
+    resumes as `task_done` is called for each result.
+    """
+
+    def __init__(self, jobs: List[MiningJob], max_in_flight: int):
+        self.jobs = jobs
+        self.slots = threading.Semaphore(max_in_flight)
+        self.stopped = False
+
+    def __iter__(self) -> Iterator[Task]:
+        while not self.stopped:
+            active = [job for job in self.jobs if not job.done]
+            if not active:
+                return
+            for job in active:
+                self.slots.acquire()
+                if self.stopped:
+                    return
+                yield job.next_task()
+
+    def task_done(self) -> None:
+        self.slots.release()
+
+    def stop(self) -> None:
+        # wake the pool's task thread if it is blocked waiting for a slot
+        self.stopped = True
+        self.slots.release()
+
+
+def run_task(task: Task) -> TaskResult:
+    game, solve, screen, seed, node_limit, options, stored, deck = task
+    if stored is not None:
+        return game, seed, stored, 0.0, True
+    shared_rng.preset_deck(seed, deck)
+    start = time.perf_counter()
+    result = screen(seed, options) if screen is not None else None
+    if result is None:
+        result = solve(seed, node_limit, options)
+    return game, seed, result, (time.perf_counter() - start) * 1000.0, False
+
+
+def mine(jobs: List[MiningJob],
+         workers: Optional[int] = None,
+         chunksize: int = 4,
+         verbose: bool = False,
+         checkpoint_interval_s: float = 10.0,
+         table_mb: Optional[float] = None) -> None:
+    by_game: Dict[str, MiningJob] = {job.spec.name: job for job in jobs}
+    for job in jobs:
+        job.load()
+
+    processes = workers or cpu_count()
+    # enough queued chunks that no worker waits on the parent between results
+    feed = SeedFeed(jobs, max_in_flight=processes * chunksize * 4)
+    last_checkpoint = time.monotonic()
+
+    with Pool(processes=processes, initializer=transposition.configure, initargs=(table_mb,)) as pool:
+        try:
+            for result in pool.imap_unordered(run_task, feed, chunksize):
+                feed.task_done()
+                game, seed, outcome, wall_ms, from_store = result
+                job = by_game[game]
+                if not from_store:
+                    job.results.append(seed, outcome, job.node_limit, wall_ms)
+                bucket = job.spec.classify(outcome, job.options)
+                if bucket is not None and seed not in job.found:
+                    if job.done:
+                        # over target: leave it unevaluated so a larger run picks it up
+                        continue
+                    job.found.add(seed)
+                    print(f"[{game}] Seed {seed} {bucket} (nodes={outcome.nodes})  [total={len(job.found)}]")
+                    job.journal.append(seed, bucket, outcome.nodes)
+                elif verbose:
+                    print(f"[{game}] Seed {seed} skipped ({outcome.verdict}, nodes={outcome.nodes})")
+                job.cursor.complete(seed)
+
+                if all(job.done for job in jobs):
+                    break
+                if time.monotonic() - last_checkpoint >= checkpoint_interval_s:
+                    for j in jobs:
+                        j.checkpoint()
+                    last_checkpoint = time.monotonic()
+        finally:
+            feed.stop()
+            for job in jobs:
+                job.checkpoint()
+                job.journal.compact(job.found)
+
+    for job in jobs:
+        print(f"[{job.spec.name}] Done. Found {len(job.found)} seeds.")
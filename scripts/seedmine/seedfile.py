@@ -0,0 +1,24 @@
+"""Reading and writing the `{"seeds": [...]}` JSON assets shipped with the app."""
+import json
+import os
+from typing import Iterable, Set
+
+
+def load_seeds(path: str) -> Set[int]:
+    if not os.path.exists(path):
+        return set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return set(int(s) for s in data.get("seeds", []))
+    except (OSError, ValueError):
+        return set()
+
+
+def save_seeds(path: str, seeds: Iterable[int]) -> None:
+    # Sorted for deterministic file; written atomically so a kill never truncates it.
+    data = {"seeds": sorted(seeds)}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
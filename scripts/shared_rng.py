@@ -1,5 +1,5 @@
 # shared_rng.py
-from typing import List, TypeVar
+from typing import List, Optional, Tuple, TypeVar
 
 T = TypeVar("T")
 
@@ -27,3 +27,78 @@ def shuffle_with_seed(seq: List[T], seed: int) -> None:
     for i in range(len(seq) - 1, 0, -1):
         j = rng.next_int(i + 1)
         seq[i], seq[j] = seq[j], seq[i]
+
+
+def deal_batch(seeds, deck_size: int = 52):
+    """
+    Deal many seeds at once: row k of the returned (len(seeds), deck_size)
+    uint8 array is `list(range(deck_size))` after `shuffle_with_seed(..., seeds[k])`.
+
+    The XorShift32 state of every seed is advanced in lockstep as a uint32
+    vector, so the cost is one NumPy pass per deck position rather than one
+    Python loop per seed. Index a game's deck with the rows to get its cards.
+    Memory is about deck_size * 10 bytes per seed; feed huge ranges in chunks.
+    """
+    import numpy as np  # only batch dealing needs NumPy
+
+    state = (np.asarray(seeds, dtype=np.int64).reshape(-1) & 0xFFFFFFFF).astype(np.uint32)
+    state[state == 0] = 1
+    n = len(state)
+    cols = np.arange(n, dtype=np.intp)
+    # position-major, so the swap target `work[i]` is one contiguous run
+    work = np.repeat(np.arange(deck_size, dtype=np.uint8), n)
+    for i in range(deck_size - 1, 0, -1):
+        state ^= state << np.uint32(13)
+        state ^= state >> np.uint32(17)
+        state ^= state << np.uint32(5)
+        flat = (state % np.uint32(i + 1)).astype(np.intp)
+        flat *= n
+        flat += cols
+        row = work[i * n:(i + 1) * n]
+        top = row.copy()
+        row[:] = work[flat]
+        work[flat] = top
+    return np.ascontiguousarray(work.reshape(deck_size, n).T)
+
+
+class BatchDealer:
+    """
+    Decks for an ascending run of seeds, dealt `block` seeds at a time with
+    `deal_batch` (its fixed NumPy cost only pays off over a few hundred
+    seeds). `deck(seed)` is None for a seed behind the current block, such as
+    a retried gap, which is then shuffled on its own.
+    """
+
+    def __init__(self, deck_size: int = 52, block: int = 1024):
+        self.deck_size = deck_size
+        self.block = block
+        self.first = 0
+        self.rows = None
+
+    def deck(self, seed: int) -> Optional[bytes]:
+        if self.rows is None or seed >= self.first + len(self.rows):
+            self.first = seed
+            self.rows = deal_batch(range(seed, seed + self.block), self.deck_size)
+        if seed < self.first:
+            return None
+        return self.rows[seed - self.first].tobytes()
+
+
+# A deck dealt ahead of time (by the miner's `BatchDealer`) for the seed this
+# process is about to deal; see `preset_deck`.
+_preset: Optional[Tuple[int, bytes]] = None
+
+
+def preset_deck(seed: int, deck: Optional[bytes]) -> None:
+    """Have the next `shuffled_deck(seed, len(deck))` return `deck` instead of shuffling."""
+    global _preset
+    _preset = (seed, deck) if deck is not None else None
+
+
+def shuffled_deck(seed: int, deck_size: int = 52) -> List[int]:
+    """`list(range(deck_size))` after `shuffle_with_seed(..., seed)`, or the preset deck for `seed`."""
+    if _preset is not None and _preset[0] == seed and len(_preset[1]) == deck_size:
+        return list(_preset[1])
+    deck = list(range(deck_size))
+    shuffle_with_seed(deck, seed)
+    return deck
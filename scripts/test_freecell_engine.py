@@ -0,0 +1,95 @@
+"""
+FreeCell checks: the solver's unsolvable proofs must agree with an
+independent search that moves one card at a time, without supermoves,
+autoplay or position canonicalisation beyond sorting, and every deal must
+use each card once.
+
+Run from `scripts/`: `python -m pytest -q`.
+"""
+import pytest
+
+import freecell_engine
+from generate_freecell_seeds import deal_tableau
+
+RED = {0, 1}  # hearts, diamonds
+
+
+def _stacks(card, onto) -> bool:
+    (suit, value), (onto_suit, onto_value) = card, onto
+    return value + 1 == onto_value and (suit in RED) != (onto_suit in RED)
+
+
+def _single_card_solvable(tableau, free_cells: int) -> bool:
+    """Exhaustive DFS over single-card moves; positions keyed up to cascade and cell order."""
+    def key(cascades, cells, foundations):
+        return tuple(sorted(cascades)), tuple(sorted(cells)), foundations
+
+    start = (tuple(tuple(col) for col in tableau), (), (0, 0, 0, 0))
+    seen = {key(*start)}
+    stack = [start]
+    while stack:
+        cascades, cells, foundations = stack.pop()
+        if sum(foundations) == 52:
+            return True
+        children = []
+        sources = [(card, ("cascade", i)) for i, col in enumerate(cascades) if col for card in col[-1:]]
+        sources += [(card, ("cell", i)) for i, card in enumerate(cells)]
+        for card, (kind, i) in sources:
+            if kind == "cascade":
+                rest = cascades[:i] + (cascades[i][:-1],) + cascades[i + 1:]
+                rest_cells = cells
+            else:
+                rest = cascades
+                rest_cells = cells[:i] + cells[i + 1:]
+            suit, value = card
+            if foundations[suit] + 1 == value:
+                children.append((rest, rest_cells,
+                                 foundations[:suit] + (value,) + foundations[suit + 1:]))
+            for j, col in enumerate(rest):
+                if not col or _stacks(card, col[-1]):
+                    children.append((rest[:j] + (col + (card,),) + rest[j + 1:], rest_cells, foundations))
+            if kind == "cascade" and len(cells) < free_cells:
+                children.append((rest, rest_cells + (card,), foundations))
+        for child in children:
+            child_key = key(*child)
+            if child_key not in seen:
+                seen.add(child_key)
+                stack.append(child)
+    return False
+
+
+@pytest.mark.parametrize("seed", [3, 8])
+def test_unsolvable_proof_matches_single_card_search(seed):
+    tableau = deal_tableau(seed)
+    result = freecell_engine.solve(tableau, free_cells=2, node_limit=200_000)
+    assert not result.solved and result.exhausted
+    assert not _single_card_solvable(tableau, 2)
+
+
+def test_solved_deal_is_solvable_one_card_at_a_time():
+    tableau = deal_tableau(5)
+    assert freecell_engine.solve(tableau, free_cells=2, node_limit=200_000).solved
+    assert _single_card_solvable(tableau, 2)
+
+
+def test_position_key_ignores_cascade_and_cell_order():
+    state = freecell_engine.initial_state(deal_tableau(7), free_cells=4)
+    for move in freecell_engine.generate_moves(state)[:6]:
+        state = freecell_engine.apply_move(state, move)
+    shuffled = state.clone()
+    shuffled.cascades.reverse()
+    shuffled.cascade_keys.reverse()
+    shuffled.cells.reverse()
+    assert shuffled.key == state.key
+    assert state.cascade_keys == [freecell_engine.CASCADE.pile_key(0, col) for col in state.cascades]
+
+
+@pytest.mark.parametrize("aces_at_bottom", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_freecell_deal_uses_every_card_once(seed, aces_at_bottom):
+    tableau = deal_tableau(seed, aces_at_bottom=aces_at_bottom)
+    assert [len(col) for col in tableau] == [7, 7, 7, 7, 6, 6, 6, 6]
+    cards = [card for col in tableau for card in col]
+    assert sorted(cards) == sorted((s, v) for s in range(4) for v in range(1, 14))
+    if aces_at_bottom:
+        assert sorted(col[0] for col in tableau[:4]) == [(s, 1) for s in range(4)]
@@ -0,0 +1,50 @@
+"""
+Klondike checks: the shared XorShift32 shuffle must stay bit-exact, since
+the shipped seed assets were mined against it, and `klondike_engine` must
+deal and search exactly like the dataclass model it replaced.
+
+Run from `scripts/`: `python -m pytest -q`.
+"""
+import pytest
+
+import generate_klondike_seeds
+import klondike_engine
+from shared_rng import XorShift32, shuffle_with_seed
+
+
+def test_xorshift32_matches_marsaglia_sequence():
+    rng = XorShift32(1)
+    assert [rng._next32() for _ in range(3)] == [270369, 67634689, 2647435461]
+
+
+def test_zero_seed_deals_like_seed_one():
+    assert XorShift32(0).state == XorShift32(1).state == 1
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 12345, 2 ** 32 + 7])
+def test_klondike_reference_rng_matches_shared_rng(seed):
+    shared, reference = list(range(52)), list(range(52))
+    shuffle_with_seed(shared, seed)
+    generate_klondike_seeds.shuffle_with_seed(reference, seed)
+    assert shared == reference
+
+
+@pytest.mark.parametrize("aces_at_bottom", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_klondike_engine_deals_like_reference(seed, aces_at_bottom):
+    engine = klondike_engine.initial_state(seed, 3, aces_at_bottom)
+    reference = generate_klondike_seeds.initial_state_from_seed(seed, 3, aces_at_bottom)
+    assert [list(col) for col in engine.hidden] == [[c.id for c in col] for col in reference.hidden]
+    assert [list(col) for col in engine.revealed] == [[c.id for c in col] for col in reference.revealed]
+    assert list(engine.stock) == [c.id for c in reference.stock]
+    assert engine.key == klondike_engine.full_hash(engine)
+
+
+@pytest.mark.parametrize("aces_at_bottom", [False, True])
+@pytest.mark.parametrize("draw_amount", [1, 3])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_klondike_engine_searches_like_reference(seed, draw_amount, aces_at_bottom):
+    # the reference model is slow, so only the start of each search is compared
+    engine = generate_klondike_seeds.solve_seed(seed, draw_amount, aces_at_bottom, node_limit=1000)
+    reference = generate_klondike_seeds.solve_seed_reference(seed, draw_amount, aces_at_bottom, node_limit=1000)
+    assert engine == reference
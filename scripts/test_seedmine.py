@@ -0,0 +1,98 @@
+"""
+seedmine persistence checks: what a killed run leaves on disk must load back
+without losing or inventing seeds.
+
+Run from `scripts/`: `python -m pytest -q`.
+"""
+import json
+import os
+
+from dfs import SearchResult
+from seedmine.checkpoint import SeedCursor
+from seedmine.journal import SeedJournal
+from seedmine.results import RESULT_DTYPE, ResultsStore
+
+
+def test_journal_skips_torn_line(tmp_path):
+    out = str(tmp_path / "seeds.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"seeds": [1, 4]}, f)
+    journal = SeedJournal(out)
+    journal.append(9, "easy", 120)
+    journal.append(7, "easy", 80)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"seed":12,"buck')  # killed mid-write
+    assert SeedJournal(out).load() == {1, 4, 7, 9}
+
+
+def test_journal_compact_sorts_and_drops_journal(tmp_path):
+    out = str(tmp_path / "seeds.json")
+    journal = SeedJournal(out)
+    journal.append(9, "easy", 120)
+    journal.append(2, "easy", 80)
+    journal.compact(journal.load())
+    with open(out, encoding="utf-8") as f:
+        assert json.load(f) == {"seeds": [2, 9]}
+    assert not (tmp_path / "seeds.json.journal").exists()
+
+
+def test_results_store_truncates_torn_record(tmp_path):
+    path = str(tmp_path / "game.results")
+    store = ResultsStore(path)
+    store.append(3, SearchResult(True, 500, 40), 1000, 1.5)
+    store.append(5, SearchResult(False, 1000), 1000, 2.0)
+    store.flush()
+    with open(path, "ab") as f:
+        f.write(b"\x07" * (RESULT_DTYPE.itemsize // 2))  # killed mid-write
+    store = ResultsStore(path)
+    assert store.load() == 2
+    assert os.path.getsize(path) == 2 * RESULT_DTYPE.itemsize
+    assert store.lookup(3, 1000) == SearchResult(True, 500, 40)
+
+
+def test_results_store_lookup_uses_latest_record(tmp_path):
+    path = str(tmp_path / "game.results")
+    store = ResultsStore(path)
+    store.append(5, SearchResult(False, 1000), 1000, 2.0)
+    store.append(6, SearchResult(False, 50, exhausted=True), 1000, 0.1)
+    store.append(5, SearchResult(True, 4000, 90), 8000, 9.0)  # re-solved at a higher limit
+    store.flush()
+    store = ResultsStore(path)
+    assert store.load() == 2
+    assert store.lookup(5, 1000) == SearchResult(True, 4000, 90)
+    assert store.lookup(6, 10 ** 9) == SearchResult(False, 50, exhausted=True)
+    assert store.lookup(7, 1000) is None
+
+
+def test_results_store_redoes_give_up_at_higher_limit(tmp_path):
+    store = ResultsStore(str(tmp_path / "game.results"))
+    store.append(5, SearchResult(False, 1000), 1000, 2.0)
+    store.flush()
+    store.load()
+    assert store.lookup(5, 1000) == SearchResult(False, 1000)
+    assert store.lookup(5, 2000) is None
+
+
+def test_cursor_redispatches_gaps_after_restart(tmp_path):
+    path = str(tmp_path / "seeds.json.checkpoint")
+    cursor = SeedCursor(path)
+    cursor.start_at(10)
+    taken = [cursor.take() for _ in range(8)]
+    assert taken == list(range(10, 18))
+    for seed in (10, 11, 13, 16):  # 12, 14, 15 and 17 still in flight at the stop
+        cursor.complete(seed)
+    cursor.save()
+
+    restarted = SeedCursor(path)
+    assert restarted.load()
+    assert restarted.contiguous == 12
+    assert [restarted.take() for _ in range(5)] == [12, 14, 15, 17, 18]
+    for seed in (12, 14, 15, 17, 18):
+        restarted.complete(seed)
+    assert restarted.contiguous == 19 and not restarted.completed
+
+
+def test_cursor_without_checkpoint(tmp_path):
+    cursor = SeedCursor(str(tmp_path / "missing.checkpoint"))
+    assert not cursor.load()
@@ -0,0 +1,48 @@
+"""
+Batch dealing checks: `deal_batch` must match `shuffle_with_seed` bit for
+bit, since the miner hands its decks to the games in place of their own
+shuffle.
+
+Run from `scripts/`: `python -m pytest -q`.
+"""
+import pytest
+
+import shared_rng
+from shared_rng import BatchDealer, deal_batch, preset_deck, shuffle_with_seed, shuffled_deck
+
+pytest.importorskip("numpy")
+
+
+def _shuffled(seed, deck_size):
+    deck = list(range(deck_size))
+    shuffle_with_seed(deck, seed)
+    return deck
+
+
+@pytest.mark.parametrize("deck_size", [52, 104])
+def test_deal_batch_matches_shuffle_with_seed(deck_size):
+    seeds = list(range(300)) + [2 ** 32, 2 ** 32 + 1, 2 ** 40 + 12345]
+    rows = deal_batch(seeds, deck_size)
+    assert rows.shape == (len(seeds), deck_size)
+    for seed, row in zip(seeds, rows):
+        assert row.tolist() == _shuffled(seed, deck_size)
+
+
+def test_batch_dealer_covers_ascending_seeds_and_skips_older_ones():
+    dealer = BatchDealer(block=8)
+    for seed in [3, 4, 10, 11, 30]:
+        assert list(dealer.deck(seed)) == _shuffled(seed, 52)
+    assert dealer.deck(29) is None
+
+
+def test_shuffled_deck_uses_only_the_matching_preset():
+    deck = bytes(range(51, -1, -1))
+    try:
+        preset_deck(7, deck)
+        assert shuffled_deck(7) == list(deck)
+        assert shuffled_deck(8) == _shuffled(8, 52)
+        assert shuffled_deck(7, 104) == _shuffled(7, 104)
+    finally:
+        preset_deck(7, None)
+    assert shared_rng._preset is None
+    assert shuffled_deck(7) == _shuffled(7, 52)
@@ -0,0 +1,40 @@
+"""
+TranspositionTable checks: a full probe window overwrites the key's home
+slot, and clearing forgets every key, including across the stamp wraparound.
+
+Run from `scripts/`: `python -m pytest -q`.
+"""
+from transposition import _MASK64, _MIX, PROBES, TranspositionTable
+
+
+def _home(table: TranspositionTable, key: int) -> int:
+    return (key * _MIX & _MASK64) >> table.shift
+
+
+def test_full_window_evicts_home_slot():
+    table = TranspositionTable(0)  # MIN_SLOTS
+    home = _home(table, 1)
+    keys = [k for k in range(1, 1 << 20) if _home(table, k) == home][:PROBES + 1]
+    for key in keys[:PROBES]:
+        table.add(key)
+    assert all(key in table for key in keys[:PROBES])
+    assert len(table) == PROBES and table.evictions == 0
+    table.add(keys[PROBES])
+    assert keys[PROBES] in table and keys[0] not in table
+    assert all(key in table for key in keys[1:PROBES])
+    assert len(table) == PROBES and table.evictions == 1
+
+
+def test_clear_forgets_keys_across_stamp_wraparound():
+    table = TranspositionTable(0)
+    table.add(42)
+    for _ in range(254):
+        table.clear()
+        assert 42 not in table
+    assert table.stamp == 255
+    table.add(7)
+    table.clear()  # wraps back to stamp 1, the stamp 42 was added under
+    assert table.stamp == 1
+    assert 42 not in table and 7 not in table and len(table) == 0
+    table.add(42)
+    assert 42 in table
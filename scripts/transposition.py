@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Bounded visited sets for the seed-mining solvers.
+
+A Python `set` of ints costs roughly 70-100 bytes per position, so a search
+with a node limit in the tens of millions can run a worker out of memory
+(and the pool runs one per core). `TranspositionTable` keeps the same 64-bit
+keys in a fixed, open-addressed `array('Q')` instead (plus a one-byte stamp
+per slot, so clearing between deals is O(1)): a key is probed in a short
+window after its home slot, and when the window is full the new key
+overwrites the home slot (always-replace, so recent positions win over old
+ones).
+
+Forgetting a position only means it may be searched again. Solved results
+and exhausted proofs stay sound, but a search can now spend nodes
+revisiting positions, even ones on its current path, so only a node limit
+guarantees it ends: the CLI refuses `--table-mb` with `--mode exact`.
+
+Solvers call `new_visited()` and use the result like a set. It is a plain
+`set` unless the process has been given a budget with `configure` (the
+mining pool does that in each worker), in which case it is the process's
+one table, cleared; so only one search per process may hold it at a time.
+"""
+from array import array
+from typing import Optional, Set, Union
+
+_MASK64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15  # Fibonacci hashing: spreads structured keys (packed states)
+PROBES = 8
+MIN_SLOTS = 1 << 10
+SLOT_BYTES = 9  # 64-bit key + stamp
+
+# visited-set budget per process in MiB; None keeps unbounded sets
+_megabytes: Optional[float] = None
+_table: Optional["TranspositionTable"] = None
+
+
+class TranspositionTable:
+    """Set-like store of 64-bit keys in about `megabytes` of memory (slots rounded down to a power of two)."""
+
+    __slots__ = ("keys", "stamps", "stamp", "mask", "shift", "count", "evictions")
+
+    def __init__(self, megabytes: float):
+        slots = max(MIN_SLOTS, int(megabytes * (1 << 20)) // SLOT_BYTES)
+        bits = slots.bit_length() - 1
+        self.keys = array("Q", bytes(8 << bits))
+        self.stamps = bytearray(1 << bits)  # a slot is in use iff its stamp is `stamp`
+        self.stamp = 1
+        self.mask = (1 << bits) - 1
+        self.shift = 64 - bits
+        self.count = 0  # occupied slots
+        self.evictions = 0  # keys overwritten because their window was full
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self.count = self.evictions = 0
+        if self.stamp == 255:
+            self.stamps[:] = bytes(len(self.stamps))
+            self.stamp = 1
+        else:
+            self.stamp += 1
+
+    def __contains__(self, key: int) -> bool:
+        key &= _MASK64
+        keys, stamps, stamp, mask = self.keys, self.stamps, self.stamp, self.mask
+        i = (key * _MIX & _MASK64) >> self.shift
+        for _ in range(PROBES):
+            if stamps[i] != stamp:
+                return False
+            if keys[i] == key:
+                return True
+            i = (i + 1) & mask
+        return False
+
+    def add(self, key: int) -> None:
+        key &= _MASK64
+        keys, stamps, stamp, mask = self.keys, self.stamps, self.stamp, self.mask
+        home = i = (key * _MIX & _MASK64) >> self.shift
+        for _ in range(PROBES):
+            if stamps[i] != stamp:
+                keys[i] = key
+                stamps[i] = stamp
+                self.count += 1
+                return
+            if keys[i] == key:
+                return
+            i = (i + 1) & mask
+        keys[home] = key
+        self.evictions += 1
+
+
+def configure(megabytes: Optional[float]) -> None:
+    """Set this process's visited-set budget (None or 0: unbounded sets)."""
+    global _megabytes, _table
+    _megabytes = megabytes or None
+    _table = None
+
+
+def new_visited() -> Union[Set[int], TranspositionTable]:
+    global _table
+    if _megabytes is None:
+        return set()
+    if _table is None:
+        _table = TranspositionTable(_megabytes)
+    else:
+        _table.clear()
+    return _table
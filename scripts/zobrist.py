@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Zobrist hashing shared by the seed-mining solvers.
+
+Each solver lays its board out as numbered slots (pile + depth, pyramid
+position, stock length, ...) and keys every (slot, card) pair with a random
+64-bit word. A position's key is the XOR of the keys of its occupied slots, so
+a move updates it in O(cards moved) and the visited sets hold plain 64-bit
+ints instead of nested tuples of the whole board.
+"""
+import random
+from typing import Iterable, List
+
+ZOBRIST_SEED = 0x9E3779B97F4A7C15
+
+
+class ZobristTable:
+    """Random 64-bit keys for `slots` board slots that can each hold one of `cards` cards."""
+
+    def __init__(self, slots: int, cards: int = 1, salt: int = 0):
+        rng = random.Random(ZOBRIST_SEED ^ salt)
+        self.slots = slots
+        self.cards = cards
+        self.keys: List[int] = [rng.getrandbits(64) for _ in range(slots * cards)]
+
+    def key(self, slot: int, card: int = 0) -> int:
+        return self.keys[slot * self.cards + card]
+
+    def pile_key(self, base_slot: int, pile: Iterable[int]) -> int:
+        """XOR of the keys of `pile` stacked bottom-up from `base_slot`."""
+        keys = self.keys
+        stride = self.cards
+        idx = base_slot * stride
+        h = 0
+        for card in pile:
+            h ^= keys[idx + card]
+            idx += stride
+        return h